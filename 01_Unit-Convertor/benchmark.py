@@ -0,0 +1,143 @@
+import argparse
+import importlib.util
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# Import statements timed in fresh interpreters; the last ones are what
+# main.py pulls in on top of the conversion core
+IMPORTS = {
+    "unit_converter": "import unit_converter",
+    "unit_converter + arrays": "import unit_converter; unit_converter.convert_array",
+    "unit_converter + exact": "import unit_converter; unit_converter.convert_exact",
+    "pandas": "import pandas",
+    "streamlit": "import streamlit"
+}
+
+
+def time_import(statement: str, repeats: int) -> Optional[Dict]:
+    """Median wall time of an import in a fresh interpreter, minus interpreter start-up"""
+    code = ("import time; _start = time.perf_counter(); " + statement +
+            "; print(time.perf_counter() - _start)")
+    samples = []
+    for _ in range(repeats):
+        completed = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                                   cwd=Path(__file__).parent)
+        if completed.returncode != 0:
+            return None
+        samples.append(float(completed.stdout))
+    return {"median_ms": round(statistics.median(samples) * 1000, 2), "min_ms": round(min(samples) * 1000, 2)}
+
+
+def time_call(func: Callable[[], object], iterations: int) -> float:
+    """Best-of-five mean time per call in microseconds"""
+    func()  # Warm-up
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        best = min(best, (time.perf_counter() - start) / iterations)
+    return best * 1e6
+
+
+def run_calls(iterations: int) -> List[Dict]:
+    import numpy as np
+
+    import unit_converter
+
+    results = [
+        {"name": "convert_units[Length]", "us_per_call": time_call(
+            lambda: unit_converter.convert_units(12.5, "Mile", "Kilometer", "Length"), iterations)},
+        {"name": "convert_units[Temperature]", "us_per_call": time_call(
+            lambda: unit_converter.convert_units(98.6, "Fahrenheit", "Celsius", "Temperature"), iterations)}
+    ]
+    for size in (1, 1_000, 1_000_000):
+        values = np.random.default_rng(0).random(size)
+        calls = max(1, iterations // max(1, size // 100))
+        per_call = time_call(lambda: unit_converter.convert_array(values, "Mile", "Kilometer", "Length"), calls)
+        results.append({"name": f"convert_array[{size:,}]", "us_per_call": per_call,
+                        "ns_per_value": per_call * 1000 / size})
+    return results
+
+
+def run_modes(iterations: int) -> List[Dict]:
+    """Float and exact conversion side by side: time per call and worst error
+
+    The error column is the worst relative error of a Mile -> Kilometer ->
+    Yard -> Mile round trip over a sweep of inputs, measured against the
+    exact result, which is always the input (floats are read as their
+    shortest repr, as convert_exact does).
+    """
+    from fractions import Fraction
+
+    import unit_converter
+    from unit_converter.exact import to_fraction
+
+    inputs = [n / 7 for n in range(1, 1001)]
+
+    def round_trip(convert) -> float:
+        worst = 0.0
+        for value in inputs:
+            result = convert(convert(convert(value, "Mile", "Kilometer", "Length"), "Kilometer", "Yard", "Length"),
+                             "Yard", "Mile", "Length")
+            exact = to_fraction(value)
+            worst = max(worst, float(abs(to_fraction(result) - exact) / exact))
+        return worst
+
+    exact_input = Fraction(25, 2)
+    return [
+        {"name": "float", "us_per_call": time_call(
+            lambda: unit_converter.convert_units(12.5, "Mile", "Kilometer", "Length"), iterations),
+         "max_rel_error": round_trip(unit_converter.convert_units)},
+        {"name": "exact (Fraction)", "us_per_call": time_call(
+            lambda: unit_converter.convert_exact(exact_input, "Mile", "Kilometer", "Length"), iterations // 10),
+         "max_rel_error": round_trip(unit_converter.convert_exact)},
+        {"name": "decimal (34 digits)", "us_per_call": time_call(
+            lambda: unit_converter.convert_decimal(exact_input, "Mile", "Kilometer", "Length"), iterations // 10),
+         "max_rel_error": round_trip(unit_converter.convert_decimal)}
+    ]
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark unit_converter import time and call latency")
+    parser.add_argument("--repeats", type=int, default=5, help="Fresh interpreters per import (default: 5)")
+    parser.add_argument("--iterations", type=int, default=100_000, help="Calls per scalar benchmark (default: 100000)")
+    parser.add_argument("-o", "--output", help="Write results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    imports = {}
+    print(f"{'import':<28} {'median ms':>10} {'min ms':>10}")
+    for name, statement in IMPORTS.items():
+        module = statement.split()[1].rstrip(";")
+        if importlib.util.find_spec(module) is None:
+            print(f"{name:<28} {'not installed':>21}")
+            continue
+        imports[name] = time_import(statement, args.repeats)
+        if imports[name] is not None:
+            print(f"{name:<28} {imports[name]['median_ms']:>10.2f} {imports[name]['min_ms']:>10.2f}")
+
+    calls = run_calls(args.iterations)
+    print(f"\n{'call':<28} {'us/call':>10} {'ns/value':>10}")
+    for row in calls:
+        per_value = f"{row['ns_per_value']:.2f}" if "ns_per_value" in row else ""
+        print(f"{row['name']:<28} {row['us_per_call']:>10.3f} {per_value:>10}")
+
+    modes = run_modes(args.iterations)
+    print(f"\n{'mode':<28} {'us/call':>10} {'max error':>10}")
+    for row in modes:
+        print(f"{row['name']:<28} {row['us_per_call']:>10.3f} {row['max_rel_error']:>10.1e}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"python": sys.version.split()[0], "imports": imports, "calls": calls,
+                       "modes": modes}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,13 +1,40 @@
 import streamlit as st
 import pandas as pd
-from datetime import datetime
 import json
+import io
+import uuid
+import unit_converter
+from pathlib import Path
+from unit_converter import CONVERSION_FACTORS, SCALES, UNIT_IDS
+from unit_converter.store import HistoryStore
+from unit_converter.favorites import evaluate_favorites
+from unit_converter.files import ColumnConversion, convert_file, detect_format
+
+# History and favorites survive restarts in a local SQLite database
+HISTORY_DB = Path(__file__).parent / "conversions.db"
+HISTORY_PAGE_SIZE = 5
+HISTORY_MAX_ROWS = 100_000  # Oldest rows beyond this are dropped, across all users
+
+@st.cache_resource
+def load_history_store():
+    """One store (and write-behind thread) shared by every session"""
+    return HistoryStore(HISTORY_DB, max_rows=HISTORY_MAX_ROWS)
+
+history_store = load_history_store()
 
 # Initialize session state
-if 'conversion_history' not in st.session_state:
-    st.session_state.conversion_history = []
-if 'favorites' not in st.session_state:
-    st.session_state.favorites = []
+if 'history_page' not in st.session_state:
+    st.session_state.history_page = 0
+if 'history_owner' not in st.session_state:
+    # Each browser has its own history and favorites, keyed by a random id
+    # kept in the page URL so reloads and restarts find them again
+    owner = st.query_params.get("user", "")
+    if not (owner.isalnum() and len(owner) == 32):
+        owner = uuid.uuid4().hex
+        st.query_params["user"] = owner
+    st.session_state.history_owner = owner
+    st.session_state.last_history_entry = None
+history_owner = st.session_state.history_owner
 
 # Category icons mapping
 category_icons = {
@@ -207,113 +234,9 @@ st.markdown("""
     </div>
 """, unsafe_allow_html=True)
 
-# Conversion dictionaries
-CONVERSION_FACTORS = {
-    "Length": {
-        "Meter": 1,
-        "Kilometer": 0.001,
-        "Centimeter": 100,
-        "Millimeter": 1000,
-        "Mile": 0.000621371,
-        "Yard": 1.09361,
-        "Foot": 3.28084,
-        "Inch": 39.3701
-    },
-    "Mass": {
-        "Kilogram": 1,
-        "Gram": 1000,
-        "Milligram": 1000000,
-        "Metric Ton": 0.001,
-        "Pound": 2.20462,
-        "Ounce": 35.274
-    },
-    "Temperature": {
-        "Celsius": "C",
-        "Fahrenheit": "F",
-        "Kelvin": "K"
-    },
-    "Area": {
-        "Square Meter": 1,
-        "Square Kilometer": 0.000001,
-        "Square Mile": 3.861e-7,
-        "Square Yard": 1.19599,
-        "Square Foot": 10.7639,
-        "Square Inch": 1550,
-        "Hectare": 0.0001,
-        "Acre": 0.000247105
-    },
-    "Volume": {
-        "Cubic Meter": 1,
-        "Liter": 1000,
-        "Milliliter": 1000000,
-        "Gallon": 264.172,
-        "Quart": 1056.69,
-        "Pint": 2113.38,
-        "Cup": 4226.75
-    },
-    "Speed": {
-        "Meters per second": 1,
-        "Kilometers per hour": 3.6,
-        "Miles per hour": 2.23694,
-        "Knots": 1.94384,
-        "Feet per second": 3.28084
-    },
-    "Time": {
-        "Second": 1,
-        "Minute": 1/60,
-        "Hour": 1/3600,
-        "Day": 1/86400,
-        "Week": 1/604800,
-        "Month": 1/2592000,
-        "Year": 1/31536000
-    },
-    "Digital Storage": {
-        "Byte": 1,
-        "Kilobyte": 1/1024,
-        "Megabyte": 1/1048576,
-        "Gigabyte": 1/1073741824,
-        "Terabyte": 1/1099511627776
-    }
-}
-
-def convert_temperature(value, from_unit, to_unit):
-    if from_unit == to_unit:
-        return value
-
-    # Convert to Celsius first
-    if from_unit == "Fahrenheit":
-        celsius = (value - 32) * 5/9
-    elif from_unit == "Kelvin":
-        celsius = value - 273.15
-    else:
-        celsius = value
-
-    # Convert from Celsius to target unit
-    if to_unit == "Fahrenheit":
-        return (celsius * 9/5) + 32
-    elif to_unit == "Kelvin":
-        return celsius + 273.15
-    return celsius
-
 def convert_units(value, from_unit, to_unit, category):
     try:
-        if not isinstance(value, (int, float)):
-            raise ValueError("Input must be a number")
-
-        if category == "Temperature":
-            return convert_temperature(value, from_unit, to_unit)
-
-        if category in CONVERSION_FACTORS:
-            # Convert to base unit first
-            base_value = value / CONVERSION_FACTORS[category][from_unit]
-            # Convert from base unit to target unit
-            result = base_value * CONVERSION_FACTORS[category][to_unit]
-
-            if not isinstance(result, (int, float)) or not str(result).replace('.','').replace('-','').isdigit():
-                raise ValueError("Invalid conversion result")
-
-            return result
-        return value
+        return unit_converter.convert_units(value, from_unit, to_unit, category)
     except Exception as e:
         st.error(f"Conversion error: {str(e)}")
         return None
@@ -324,23 +247,29 @@ main_col, sidebar_col = st.columns([2, 1])
 with sidebar_col:
     st.sidebar.header("📋 Recent Conversions")
 
-    # Export history button
-    if st.session_state.conversion_history:
-        df = pd.DataFrame(st.session_state.conversion_history)
-        csv = df.to_csv(index=False)
-        st.sidebar.download_button(
-            label="📥 Export History to CSV",
-            data=csv,
-            file_name="conversion_history.csv",
-            mime="text/csv"
-        )
+    history_total = history_store.count(history_owner)
+
+    # Export history button; the CSV is only built once export is requested
+    if history_total:
+        if st.sidebar.button("📥 Export History to CSV"):
+            st.sidebar.download_button(
+                label="💾 Download CSV",
+                data=history_store.to_csv(history_owner),
+                file_name="conversion_history.csv",
+                mime="text/csv"
+            )
 
     if st.sidebar.button("🗑️ Clear History"):
-        st.session_state.conversion_history = []
+        history_store.clear(history_owner)
+        st.session_state.last_history_entry = None
+        history_total = 0
+        st.session_state.history_page = 0
         st.sidebar.success("History cleared!")
 
-    if st.session_state.conversion_history:
-        for entry in reversed(st.session_state.conversion_history[-5:]):
+    if history_total:
+        pages = (history_total + HISTORY_PAGE_SIZE - 1) // HISTORY_PAGE_SIZE
+        page = min(st.session_state.history_page, pages - 1)
+        for entry in history_store.recent(history_owner, HISTORY_PAGE_SIZE, page * HISTORY_PAGE_SIZE):
             st.sidebar.markdown(
                 f"""<div class="history-item">
                     <small>{entry['timestamp']}</small><br>
@@ -350,6 +279,20 @@ with sidebar_col:
                 </div>""",
                 unsafe_allow_html=True
             )
+
+        # Older pages come straight from the database, newest first
+        if pages > 1:
+            prev_col, page_col, next_col = st.sidebar.columns([1, 2, 1])
+            with prev_col:
+                if st.button("◀", key="history_prev", disabled=page == 0):
+                    st.session_state.history_page = page - 1
+                    st.rerun()
+            with page_col:
+                st.caption(f"Page {page + 1} of {pages:,}")
+            with next_col:
+                if st.button("▶", key="history_next", disabled=page >= pages - 1):
+                    st.session_state.history_page = page + 1
+                    st.rerun()
     else:
         st.sidebar.info("No conversions yet!")
 
@@ -446,17 +389,11 @@ with main_col:
         st.code(f"{value} {from_unit} = {result:.6g} {to_unit}")
         st.toast("Result copied to clipboard!", icon="✅")
 
-    # Add to history
-    if result is not None:
-        history_entry = {
-            'timestamp': datetime.now().strftime("%H:%M:%S"),
-            'category': category,
-            'from_value': value,
-            'from_unit': from_unit,
-            'to_value': result,
-            'to_unit': to_unit
-        }
-        st.session_state.conversion_history.append(history_entry)
+    # Add to history (repeating this session's newest entry on a rerun is ignored)
+    history_entry = (category, from_unit, to_unit, value, result)
+    if result is not None and history_entry != st.session_state.last_history_entry:
+        history_store.append(history_owner, *history_entry)
+        st.session_state.last_history_entry = history_entry
 
     # Formula display
     with st.expander("📖 View Conversion Formula"):
@@ -467,39 +404,72 @@ with main_col:
                     "- Kelvin to Celsius: °C = K - 273.15")
         else:
             base_unit = list(CONVERSION_FACTORS[category].keys())[0]
-            st.info(f"Conversion is done through {base_unit} as the base unit.")
+            from_id, to_id = UNIT_IDS[category][from_unit], UNIT_IDS[category][to_unit]
+            factor = SCALES[category][from_id][to_id]
+            exact_factor = unit_converter.EXACT_SCALES[category][from_id][to_id]
+            st.info(f"1 {from_unit} = {factor:.6g} {to_unit}\n\n"
+                    f"Exactly: 1 {from_unit} = {exact_factor} {to_unit}\n\n"
+                    f"Factors are defined exactly relative to {base_unit} and combined ahead of time, "
+                    f"so each conversion is a single multiplication.")
 
     # Add favorite conversions feature
     with st.expander("⭐ Favorite Conversions"):
         # Add current conversion to favorites
         if st.button("Save Current Conversion as Favorite"):
-            favorite = {
-                'category': category,
-                'from_unit': from_unit,
-                'to_unit': to_unit,
-                'value': value
-            }
-            if favorite not in st.session_state.favorites:
-                st.session_state.favorites.append(favorite)
+            if history_store.add_favorite(history_owner, category, from_unit, to_unit, value):
                 st.success("Added to favorites!")
 
         # Display favorites
-        if st.session_state.favorites:
-            for idx, fav in enumerate(st.session_state.favorites):
+        favorites = history_store.favorites(history_owner)
+        if favorites:
+            # Memoized, so only recomputed when favorites or the tables change
+            favorite_results = evaluate_favorites(favorites)
+            for fav, fav_result in zip(favorites, favorite_results):
                 cols = st.columns([3, 1])
                 with cols[0]:
-                    result = convert_units(fav['value'], fav['from_unit'], fav['to_unit'], fav['category'])
                     st.markdown(f"""
                         {category_icons.get(fav['category'], '')} **{fav['category']}**:
-                        {fav['value']} {fav['from_unit']} → {result:.6g} {fav['to_unit']}
+                        {fav['value']} {fav['from_unit']} → {fav_result:.6g} {fav['to_unit']}
                     """)
                 with cols[1]:
-                    if st.button("🗑️", key=f"del_fav_{idx}"):
-                        st.session_state.favorites.pop(idx)
+                    if st.button("🗑️", key=f"del_fav_{fav['id']}"):
+                        history_store.remove_favorite(history_owner, fav['id'])
                         st.rerun()
         else:
             st.info("No favorites saved yet!")
 
+    # Convert whole columns of an uploaded file with the selected units
+    with st.expander("📂 Convert a File"):
+        uploaded = st.file_uploader("CSV or Parquet file", type=["csv", "parquet"])
+        if uploaded is not None:
+            file_format = detect_format(uploaded.name)
+            try:
+                if file_format == "parquet":
+                    import pyarrow.parquet as pq
+                    file_columns = pq.ParquetFile(uploaded).schema_arrow.names
+                else:
+                    file_columns = list(pd.read_csv(uploaded, nrows=0).columns)
+            except Exception as e:
+                st.error(f"Could not read file: {str(e)}")
+                file_columns = []
+            uploaded.seek(0)
+
+            selected_columns = st.multiselect(f"Columns to convert from {from_unit} to {to_unit}", file_columns)
+            if selected_columns and st.button("Convert File"):
+                conversions = [ColumnConversion(column, category, from_unit, to_unit) for column in selected_columns]
+                converted = io.BytesIO() if file_format == "parquet" else io.StringIO()
+                try:
+                    rows = convert_file(uploaded, converted, conversions,
+                                        input_format=file_format, output_format=file_format)
+                    st.download_button(
+                        label=f"📥 Download Converted File ({rows:,} rows)",
+                        data=converted.getvalue(),
+                        file_name=f"converted_{uploaded.name}",
+                        mime="application/octet-stream" if file_format == "parquet" else "text/csv"
+                    )
+                except Exception as e:
+                    st.error(f"Conversion error: {str(e)}")
+
     # Add to the quick_conversions dictionary
     quick_conversions.update({
         "Volume": [
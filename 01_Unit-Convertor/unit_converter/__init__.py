@@ -0,0 +1,32 @@
+"""Unit conversion core without any UI
+
+Importing the package only loads the plain-Python tables and scalar
+functions. The array API (convert_array, convert_ids and the NumPy
+matrices) is imported on first use, so jobs that never touch arrays
+never pay for NumPy. The exact Fraction API (convert_exact,
+convert_decimal) is loaded the same way, keeping fractions and decimal
+out of the default import.
+"""
+
+from .favorites import evaluate_favorites
+from .scalar import convert_temperature, convert_units
+from .tables import CATEGORIES, CATEGORY_IDS, CONVERSION_FACTORS, OFFSETS, SCALES, TABLES_VERSION, UNIT_IDS
+
+_ARRAY_API = ("convert_array", "convert_ids", "SCALE_MATRICES", "OFFSET_MATRICES")
+_EXACT_API = ("convert_exact", "convert_decimal", "EXACT_SCALES", "EXACT_OFFSETS")
+
+__all__ = [
+    "CONVERSION_FACTORS", "CATEGORIES", "CATEGORY_IDS", "UNIT_IDS", "SCALES", "OFFSETS",
+    "TABLES_VERSION", "convert_temperature", "convert_units", "evaluate_favorites", *_ARRAY_API,
+    *_EXACT_API
+]
+
+
+def __getattr__(name):
+    if name in _ARRAY_API:
+        from . import arrays
+        return getattr(arrays, name)
+    if name in _EXACT_API:
+        from . import exact
+        return getattr(exact, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,58 @@
+import argparse
+import sys
+import time
+from typing import List
+
+from .files import convert_file, list_units, parse_conversion
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m unit_converter",
+        description="Convert columns of a CSV or Parquet file between units, streaming it in chunks"
+    )
+    parser.add_argument("input", nargs="?", help="CSV or Parquet file (- for CSV on stdin)")
+    parser.add_argument("output", nargs="?", help="CSV or Parquet file to write (- for CSV on stdout)")
+    parser.add_argument("-c", "--convert", action="append", default=[], metavar="COLUMN:FROM:TO[:NEW_COLUMN]",
+                        help='Column to convert, e.g. "temp:Fahrenheit:Celsius" or "dist:Mile:Kilometer:dist_km"')
+    parser.add_argument("--chunk-size", type=int, default=100_000, help="Rows per chunk (default: 100000)")
+    parser.add_argument("--input-format", choices=("csv", "parquet"), help="Override the format from the file name")
+    parser.add_argument("--output-format", choices=("csv", "parquet"), help="Override the format from the file name")
+    parser.add_argument("--list-units", action="store_true", help="Print the available units and exit")
+    args = parser.parse_args(argv)
+
+    if args.list_units:
+        print(list_units())
+        return 0
+    if not args.input or not args.output or not args.convert:
+        parser.error("input, output and at least one --convert are required")
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+    try:
+        conversions = [parse_conversion(spec) for spec in args.convert]
+    except ValueError as e:
+        parser.error(str(e))
+
+    start = time.perf_counter()
+    last_report = start
+
+    def progress(rows: int) -> None:
+        nonlocal last_report
+        now = time.perf_counter()
+        if now - last_report >= 5:
+            print(f"{rows:,} rows converted ({rows / (now - start):,.0f}/s)", file=sys.stderr)
+            last_report = now
+
+    try:
+        rows = convert_file(args.input, args.output, conversions, args.chunk_size,
+                            args.input_format, args.output_format, progress)
+    except (ValueError, ImportError, OSError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - start
+    print(f"Done: {rows:,} rows in {elapsed:.1f}s ({rows / max(elapsed, 1e-9):,.0f}/s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
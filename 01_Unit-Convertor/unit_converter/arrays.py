@@ -0,0 +1,62 @@
+import sys
+
+import numpy as np
+
+from .tables import CONVERSION_FACTORS, OFFSETS, SCALES, UNIT_IDS
+
+# Read-only NumPy copies of the unit x unit tables
+SCALE_MATRICES = {category: np.array(table, dtype=np.float64) for category, table in SCALES.items()}
+OFFSET_MATRICES = {category: np.array(table, dtype=np.float64) for category, table in OFFSETS.items()}
+for _matrix in (*SCALE_MATRICES.values(), *OFFSET_MATRICES.values()):
+    _matrix.flags.writeable = False
+
+
+def convert_array(values, from_unit, to_unit, category):
+    """Convert a whole NumPy array or pandas Series in one vectorized step
+
+    Non-temperature units are a single multiply by the combined factor,
+    temperature is a single affine transform (scale and offset). Values
+    are converted to float64; NaN stays NaN and infinities stay infinite,
+    and a finite value that overflows becomes inf instead of raising.
+    A Series comes back as a Series with the same index and name.
+    """
+    if category not in CONVERSION_FACTORS:
+        raise ValueError(f"Unknown category: {category}")
+    unit_ids = UNIT_IDS[category]
+    for unit in (from_unit, to_unit):
+        if unit not in unit_ids:
+            raise ValueError(f"Unknown {category} unit: {unit}")
+
+    converted = convert_ids(values, unit_ids[from_unit], unit_ids[to_unit], category)
+    # pandas is never imported here; a Series can only exist if the caller has
+    pd = sys.modules.get("pandas")
+    if pd is not None and isinstance(values, pd.Series):
+        return pd.Series(converted, index=values.index, name=values.name)
+    return converted
+
+
+def convert_ids(values, from_ids, to_ids, category):
+    """Convert values by unit ID; the IDs may be arrays, one unit pair per value
+
+    Factors are gathered from the category's matrix with the ID arrays,
+    so a column of mixed units converts in one vectorized expression.
+    IDs must be integers from UNIT_IDS[category]; anything else (including
+    negative IDs, which NumPy would otherwise count from the end) raises
+    ValueError.
+    """
+    if category not in SCALE_MATRICES:
+        raise ValueError(f"Unknown category: {category}")
+    units = len(SCALE_MATRICES[category])
+    from_ids, to_ids = np.asarray(from_ids), np.asarray(to_ids)
+    for ids in (from_ids, to_ids):
+        if ids.dtype.kind not in "iu":
+            raise ValueError(f"Unit IDs must be integers, got {ids.dtype}")
+        if ids.size and (ids.min() < 0 or ids.max() >= units):
+            raise ValueError(f"Unit IDs for {category} must be between 0 and {units - 1}")
+
+    array = np.asarray(values, dtype=np.float64)
+    with np.errstate(over="ignore", invalid="ignore"):
+        converted = array * SCALE_MATRICES[category][from_ids, to_ids]
+        if category in OFFSET_MATRICES:
+            converted += OFFSET_MATRICES[category][from_ids, to_ids]
+    return converted
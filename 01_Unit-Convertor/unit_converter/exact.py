@@ -0,0 +1,73 @@
+from decimal import Decimal, localcontext
+from fractions import Fraction
+from numbers import Rational
+from typing import Union
+
+from .tables import CATEGORIES, EXACT_SIZES, EXACT_TEMPERATURES, UNIT_IDS
+
+ExactValue = Union[int, float, str, Decimal, Fraction]
+
+
+def _build_exact_tables():
+    """Unit x unit Fraction tables in the layout of tables.SCALES and tables.OFFSETS
+
+    Built from the same integer definitions as the float tables, reduced
+    once here so a conversion is one Fraction multiply and add.
+    """
+    scales, offsets = {}, {}
+    for category, sizes in EXACT_SIZES.items():
+        pairs = [Fraction(*size) for size in sizes.values()]
+        scales[category] = tuple(tuple(from_size / to_size for to_size in pairs) for from_size in pairs)
+
+    pairs = [(Fraction(*scale), Fraction(*offset)) for scale, offset in EXACT_TEMPERATURES.values()]
+    scales["Temperature"] = tuple(
+        tuple(to_scale / from_scale for to_scale, _ in pairs) for from_scale, _ in pairs
+    )
+    offsets["Temperature"] = tuple(
+        tuple(to_offset - from_offset * to_scale / from_scale for to_scale, to_offset in pairs)
+        for from_scale, from_offset in pairs
+    )
+    return {category: scales[category] for category in CATEGORIES}, offsets
+
+
+EXACT_SCALES, EXACT_OFFSETS = _build_exact_tables()
+
+
+def to_fraction(value: ExactValue) -> Fraction:
+    """Exact value of an input; floats are read as their shortest repr, so 0.1 is 1/10"""
+    if isinstance(value, bool):
+        raise ValueError("Please enter a valid number")
+    if isinstance(value, Rational):
+        return Fraction(value)
+    if isinstance(value, float):
+        value = repr(value)
+    try:
+        return Fraction(value.strip() if isinstance(value, str) else value)
+    except (TypeError, ArithmeticError, ValueError):
+        raise ValueError("Please enter a valid number") from None
+
+
+def convert_exact(value: ExactValue, from_unit: str, to_unit: str, category: str) -> Fraction:
+    """Convert a value with no rounding at all, returning a reduced Fraction
+
+    Accepts ints, Fractions, Decimals and decimal or "p/q" strings; NaN and
+    infinity have no exact value and raise ValueError like unknown units do.
+    """
+    value = to_fraction(value)
+    unit_ids = UNIT_IDS.get(category)
+    if unit_ids is None or from_unit not in unit_ids or to_unit not in unit_ids:
+        raise ValueError(f"Unknown conversion: {from_unit} -> {to_unit} in {category}")
+    from_id, to_id = unit_ids[from_unit], unit_ids[to_unit]
+    converted = value * EXACT_SCALES[category][from_id][to_id]
+    if category in EXACT_OFFSETS:
+        converted += EXACT_OFFSETS[category][from_id][to_id]
+    return converted
+
+
+def convert_decimal(value: ExactValue, from_unit: str, to_unit: str, category: str,
+                    precision: int = 34) -> Decimal:
+    """Exact conversion rounded once to precision significant digits"""
+    converted = convert_exact(value, from_unit, to_unit, category)
+    with localcontext() as context:
+        context.prec = precision
+        return Decimal(converted.numerator) / Decimal(converted.denominator)
@@ -0,0 +1,44 @@
+from functools import lru_cache
+from typing import Dict, Iterable, List, Tuple
+
+from .tables import TABLES_VERSION, UNIT_IDS
+
+FavoriteKey = Tuple[str, str, str, float]
+
+
+def favorite_key(favorite: Dict) -> FavoriteKey:
+    return (favorite["category"], favorite["from_unit"], favorite["to_unit"], float(favorite["value"]))
+
+
+def evaluate_favorites(favorites: Iterable[Dict]) -> List[float]:
+    """Converted value for each favorite, in order
+
+    Results are memoized by the favorites' (category, from_unit, to_unit,
+    value) keys and TABLES_VERSION, so reruns with unchanged favorites cost
+    one cache lookup. When something did change, every favorite is
+    converted at once: one gather-and-multiply per category. A favorite
+    whose units no longer exist evaluates to NaN.
+    """
+    return list(_evaluate(tuple(favorite_key(favorite) for favorite in favorites), TABLES_VERSION))
+
+
+@lru_cache(maxsize=64)
+def _evaluate(keys: Tuple[FavoriteKey, ...], tables_version: str) -> Tuple[float, ...]:
+    import numpy as np
+
+    from .arrays import convert_ids
+
+    results = np.full(len(keys), np.nan)
+    by_category: Dict[str, List[int]] = {}
+    for position, (category, from_unit, to_unit, _) in enumerate(keys):
+        unit_ids = UNIT_IDS.get(category)
+        if unit_ids is not None and from_unit in unit_ids and to_unit in unit_ids:
+            by_category.setdefault(category, []).append(position)
+
+    for category, positions in by_category.items():
+        unit_ids = UNIT_IDS[category]
+        from_ids = np.array([unit_ids[keys[position][1]] for position in positions], dtype=np.intp)
+        to_ids = np.array([unit_ids[keys[position][2]] for position in positions], dtype=np.intp)
+        values = np.array([keys[position][3] for position in positions], dtype=np.float64)
+        results[positions] = convert_ids(values, from_ids, to_ids, category)
+    return tuple(results.tolist())
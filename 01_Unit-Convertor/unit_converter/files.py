@@ -0,0 +1,226 @@
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from typing import Callable, Iterator, List, NamedTuple, Optional
+
+from .tables import CONVERSION_FACTORS, UNIT_IDS
+
+PARQUET_SUFFIXES = (".parquet", ".pq")
+
+
+class ColumnConversion(NamedTuple):
+    """One column to convert; output_column defaults to overwriting it"""
+    column: str
+    category: str
+    from_unit: str
+    to_unit: str
+    output_column: Optional[str] = None
+
+
+def find_category(from_unit: str, to_unit: str) -> str:
+    """The category that has both units, e.g. "Length" for Mile and Meter"""
+    for category, unit_ids in UNIT_IDS.items():
+        if from_unit in unit_ids and to_unit in unit_ids:
+            return category
+    raise ValueError(f"No category has both {from_unit!r} and {to_unit!r}")
+
+
+def parse_conversion(spec: str) -> ColumnConversion:
+    """Parse 'column:from_unit:to_unit[:output_column]' as used by the CLI"""
+    parts = spec.split(":")
+    if len(parts) not in (3, 4):
+        raise ValueError(f"Expected column:from_unit:to_unit[:output_column], got {spec!r}")
+    column, from_unit, to_unit = parts[:3]
+    output_column = parts[3] if len(parts) == 4 else None
+    return ColumnConversion(column, find_category(from_unit, to_unit), from_unit, to_unit, output_column)
+
+
+def detect_format(path) -> str:
+    return "parquet" if Path(str(path)).suffix.lower() in PARQUET_SUFFIXES else "csv"
+
+
+def convert_file(source, output, conversions: List[ColumnConversion], chunk_size: int = 100_000,
+                 input_format: Optional[str] = None, output_format: Optional[str] = None,
+                 progress: Optional[Callable[[int], None]] = None) -> int:
+    """Stream a CSV or Parquet file through the converter and return the row count
+
+    The input is read chunk_size rows at a time, each conversion is one
+    vectorized operation over the chunk's column, and the chunk is written
+    out before the next one is read, so memory depends on chunk_size and
+    not on the file size. source and output are paths or open files (text
+    for CSV, binary for Parquet); "-" means stdin/stdout for CSV. Parquet
+    needs pyarrow. Columns that are not converted are copied unchanged.
+    """
+    from .arrays import convert_ids
+
+    for conversion in conversions:
+        unit_ids = UNIT_IDS.get(conversion.category)
+        if unit_ids is None or conversion.from_unit not in unit_ids or conversion.to_unit not in unit_ids:
+            raise ValueError(f"Unknown units for column {conversion.column!r}: "
+                             f"{conversion.from_unit} -> {conversion.to_unit}")
+
+    input_format = input_format or detect_format(source)
+    output_format = output_format or detect_format(output)
+    rows = 0
+    with _ChunkWriter(output, output_format) as writer:
+        for chunk in _read_chunks(source, input_format, chunk_size):
+            for conversion in conversions:
+                if conversion.column not in chunk.columns:
+                    raise ValueError(f"Column {conversion.column!r} not found in {source}")
+                unit_ids = UNIT_IDS[conversion.category]
+                values = chunk[conversion.column].to_numpy(dtype="float64", na_value=float("nan"))
+                chunk[conversion.output_column or conversion.column] = convert_ids(
+                    values, unit_ids[conversion.from_unit], unit_ids[conversion.to_unit], conversion.category
+                )
+            writer.write(chunk)
+            rows += len(chunk)
+            if progress is not None:
+                progress(rows)
+    return rows
+
+
+def _read_chunks(source, input_format: str, chunk_size: int) -> Iterator:
+    """Yield pandas DataFrames of at most chunk_size rows"""
+    if input_format == "parquet":
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(source)
+        for batch in parquet_file.iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+        return
+
+    import pandas as pd
+
+    with pd.read_csv(sys.stdin if source == "-" else source, chunksize=chunk_size) as reader:
+        yield from reader
+
+
+class _ChunkWriter:
+    """Appends DataFrame chunks to a CSV or Parquet output
+
+    Output meant for a path is written to a temporary file beside it and
+    renamed into place only once every chunk is in, so a failed conversion
+    never leaves a partial file that looks complete. Parquet needs one
+    schema for the whole file, but CSV chunks are typed one at a time: when
+    a chunk needs a wider type than the file has so far (an int column that
+    later holds 1.5, an empty column that later holds text), the row groups
+    already written are copied into a new file with the widened schema.
+    Types only ever widen (null -> int -> float -> string), so that happens
+    at most a few times per column.
+    """
+
+    def __init__(self, output, output_format: str):
+        self.output = output
+        self.output_format = output_format
+        self._parquet_writer = None
+        self._schema = None
+        self._header = True
+        self._stream = None
+        self._target = output if isinstance(output, (str, Path)) else None  # None: an open file
+        self._tmp_path = None
+
+    def __enter__(self) -> "_ChunkWriter":
+        if self.output == "-" and self.output_format == "csv":
+            self._stream = sys.stdout
+        elif self.output_format == "parquet":
+            # Parquet always goes through a file of ours, so it can be rewritten
+            self._tmp_path = self._temporary_path(self._target)
+        elif self._target is not None:
+            self._tmp_path = self._temporary_path(self._target)
+            self._stream = open(self._tmp_path, "w", newline="", encoding="utf-8")
+        else:
+            self._stream = self.output
+        return self
+
+    @staticmethod
+    def _temporary_path(output) -> Path:
+        if output is None:
+            handle, path = tempfile.mkstemp(suffix=".parquet")
+        else:
+            output = Path(output)
+            handle, path = tempfile.mkstemp(prefix=f".{output.name}.", suffix=".tmp", dir=output.parent)
+        os.close(handle)
+        return Path(path)
+
+    def write(self, chunk) -> None:
+        if self.output_format == "parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if self._parquet_writer is None:
+                self._schema = table.schema
+                self._parquet_writer = pq.ParquetWriter(self._tmp_path, self._schema)
+            elif table.schema != self._schema:
+                schema = _widen_schema(self._schema, table.schema)
+                if schema != self._schema:
+                    self._rewrite(schema)
+                table = table.cast(schema, safe=False)
+            self._parquet_writer.write_table(table)
+        else:
+            chunk.to_csv(self._stream, header=self._header, index=False)
+            self._header = False
+
+    def _rewrite(self, schema) -> None:
+        """Copy the row groups written so far into a new file with a wider schema"""
+        import pyarrow.parquet as pq
+
+        self._parquet_writer.close()
+        old_path = self._tmp_path
+        self._tmp_path = self._temporary_path(self._target)
+        self._schema = schema
+        self._parquet_writer = pq.ParquetWriter(self._tmp_path, schema)
+        try:
+            with pq.ParquetFile(old_path) as written:
+                for row_group in range(written.num_row_groups):
+                    self._parquet_writer.write_table(written.read_row_group(row_group).cast(schema, safe=False))
+        finally:
+            old_path.unlink()
+
+    def __exit__(self, exc_type, *exc_info) -> None:
+        try:
+            if self._parquet_writer is not None:
+                self._parquet_writer.close()
+            if self._tmp_path is not None and self._stream is not None:
+                self._stream.close()
+            if exc_type is None and self._tmp_path is not None:
+                if self._target is not None:
+                    os.replace(self._tmp_path, self.output)
+                else:
+                    with open(self._tmp_path, "rb") as f:
+                        shutil.copyfileobj(f, self.output)
+        finally:
+            if self._tmp_path is not None and self._tmp_path.exists():
+                self._tmp_path.unlink()
+
+
+def _widen_schema(schema, other):
+    """The narrowest schema both chunks' columns can be cast to without failing"""
+    import pyarrow as pa
+
+    if schema.names != other.names:
+        raise ValueError(f"Chunk columns changed from {schema.names} to {other.names}")
+    fields = []
+    for field, other_field in zip(schema, other):
+        a, b = field.type, other_field.type
+        if a == b or pa.types.is_null(b):
+            widened = a
+        elif pa.types.is_null(a):
+            widened = b
+        elif pa.types.is_integer(a) and pa.types.is_integer(b):
+            widened = pa.int64()
+        elif all(pa.types.is_integer(t) or pa.types.is_floating(t) for t in (a, b)):
+            widened = pa.float64()
+        else:
+            widened = pa.string()
+        fields.append(pa.field(field.name, widened))
+    widened_schema = pa.schema(fields)
+    # Keep the original (pandas metadata and all) unless a type really changed
+    return schema if widened_schema.equals(schema) else widened_schema
+
+
+def list_units() -> str:
+    """Categories and their units, one category per line"""
+    return "\n".join(f"{category}: {', '.join(units)}" for category, units in CONVERSION_FACTORS.items())
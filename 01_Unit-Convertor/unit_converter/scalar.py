@@ -0,0 +1,31 @@
+import math
+
+from .tables import CONVERSION_FACTORS, OFFSETS, SCALES, UNIT_IDS
+
+
+def convert_temperature(value, from_unit, to_unit):
+    """Convert a temperature; same tables, and so the same result, as the array path"""
+    return convert_units(value, from_unit, to_unit, "Temperature")
+
+
+def convert_units(value, from_unit, to_unit, category):
+    """Convert one number; raises ValueError for bad input or unknown units"""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError("Input must be a number")
+    if category not in CONVERSION_FACTORS:
+        raise ValueError(f"Unknown category: {category}")
+    unit_ids = UNIT_IDS[category]
+    if from_unit not in unit_ids or to_unit not in unit_ids:
+        raise ValueError(f"Unknown {category} unit: {from_unit if from_unit not in unit_ids else to_unit}")
+
+    # One precomputed factor (and offset, for temperature) instead of going
+    # through the base unit, exactly as convert_array does
+    from_id, to_id = unit_ids[from_unit], unit_ids[to_unit]
+    result = value * SCALES[category][from_id][to_id]
+    if category in OFFSETS:
+        result += OFFSETS[category][from_id][to_id]
+
+    # NaN and infinite inputs pass through; only overflow is an error
+    if math.isfinite(value) and not math.isfinite(result):
+        raise ValueError("Conversion result is out of range")
+    return result
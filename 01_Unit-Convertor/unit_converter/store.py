@@ -0,0 +1,232 @@
+import csv
+import io
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+# Timestamps are kept across restarts, so they include the date
+STORE_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY,
+    owner TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    category TEXT NOT NULL,
+    from_value REAL,
+    from_unit TEXT NOT NULL,
+    to_value REAL,
+    to_unit TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS history_owner ON history (owner, timestamp);
+CREATE INDEX IF NOT EXISTS history_owner_category ON history (owner, category, timestamp);
+CREATE INDEX IF NOT EXISTS history_owner_units ON history (owner, from_unit, to_unit, timestamp);
+
+CREATE TABLE IF NOT EXISTS favorites (
+    id INTEGER PRIMARY KEY,
+    owner TEXT NOT NULL,
+    created REAL NOT NULL,
+    category TEXT NOT NULL,
+    from_unit TEXT NOT NULL,
+    to_unit TEXT NOT NULL,
+    value REAL NOT NULL,
+    UNIQUE (owner, category, from_unit, to_unit, value)
+);
+"""
+
+_HISTORY_COLUMNS = "timestamp, category, from_value, from_unit, to_value, to_unit"
+
+
+class HistoryStore:
+    """Conversion history and favorites in a local SQLite database
+
+    One store can serve many users: every row belongs to an owner (the app
+    uses one per browser), and every query and clear() only sees the
+    caller's rows. History rows are written behind: append only puts the
+    row on a queue, and a background thread inserts whatever has queued up
+    in a single transaction every flush_interval seconds (or as soon as
+    batch_size rows are waiting). History queries flush first, so they
+    always see earlier appends. The history table is indexed by owner plus
+    timestamp, category and unit pair, so the newest page of any filter is
+    an index range scan rather than a sort. After each batch the oldest
+    rows beyond max_rows (across all owners) are deleted, so the file stays
+    bounded on a shared kiosk. Favorites are few and user-initiated, so
+    they are written directly and read without waiting on the writer.
+    Skipping repeats of the last conversion is up to the caller, since only
+    it knows which appends come from the same user.
+    """
+
+    def __init__(self, path: Union[str, Path], batch_size: int = 100, flush_interval: float = 0.5,
+                 max_rows: int = 100_000):
+        if max_rows < 1:
+            raise ValueError("max_rows must be at least 1")
+        self.path = str(path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_rows = max_rows
+        self._connection = self._connect()
+        self._connection.executescript(_SCHEMA)
+        self._lock = threading.Lock()  # Guards the shared read/favorites connection
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._writer = threading.Thread(target=self._write_behind, name="history-writer", daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=10, check_same_thread=False, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def _write_behind(self) -> None:
+        connection = self._connect()
+        try:
+            while True:
+                rows = [self._queue.get()]
+                deadline = time.monotonic() + self.flush_interval
+                # Stop early at a flush() marker (()) or the close() marker (None)
+                while rows[-1] and len(rows) < self.batch_size:
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    try:
+                        rows.append(self._queue.get(timeout=timeout))
+                    except queue.Empty:
+                        break
+
+                stop = rows[-1] is None
+                batch = [row for row in rows if row]
+                try:
+                    if batch:
+                        connection.execute("BEGIN")
+                        try:
+                            connection.executemany(
+                                f"INSERT INTO history (owner, {_HISTORY_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                batch
+                            )
+                            # Row IDs only grow, so this keeps the newest max_rows rows
+                            connection.execute("DELETE FROM history WHERE id <= (SELECT max(id) FROM history) - ?",
+                                               (self.max_rows,))
+                            connection.execute("COMMIT")
+                        except sqlite3.Error as e:
+                            # History is best effort: drop the batch rather than the writer
+                            connection.execute("ROLLBACK")
+                            print(f"history-writer: dropped {len(batch)} rows: {e}", file=sys.stderr)
+                finally:
+                    for _ in rows:
+                        self._queue.task_done()
+                if stop:
+                    return
+        finally:
+            connection.close()
+
+    def append(self, owner: str, category: str, from_unit: str, to_unit: str, from_value: float,
+               to_value: float, timestamp: Optional[float] = None) -> None:
+        """Queue a conversion for owner's history"""
+        self._queue.put((owner, time.time() if timestamp is None else timestamp,
+                         category, from_value, from_unit, to_value, to_unit))
+
+    def flush(self) -> None:
+        """Wait until every queued row is in the database"""
+        if self._writer.is_alive():
+            self._queue.put(())
+            self._queue.join()
+
+    def close(self) -> None:
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+        self._connection.close()
+
+    def __enter__(self) -> "HistoryStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _query(self, sql: str, params: tuple = (), flush: bool = True) -> List[sqlite3.Row]:
+        if flush:
+            self.flush()
+        with self._lock:
+            cursor = self._connection.execute(sql, params)
+            cursor.row_factory = sqlite3.Row
+            return cursor.fetchall()
+
+    @staticmethod
+    def _filters(owner: str, category: Optional[str], from_unit: Optional[str], to_unit: Optional[str]) -> tuple:
+        clauses, params = ["owner = ?"], [owner]
+        for column, value in (("category", category), ("from_unit", from_unit), ("to_unit", to_unit)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        return " WHERE " + " AND ".join(clauses), tuple(params)
+
+    def recent(self, owner: str, limit: int = 5, offset: int = 0, category: Optional[str] = None,
+               from_unit: Optional[str] = None, to_unit: Optional[str] = None) -> List[Dict]:
+        """One page of owner's history, newest first, optionally filtered"""
+        where, params = self._filters(owner, category, from_unit, to_unit)
+        rows = self._query(
+            f"SELECT {_HISTORY_COLUMNS} FROM history{where} ORDER BY timestamp DESC, id DESC LIMIT ? OFFSET ?",
+            params + (limit, offset)
+        )
+        return [_history_entry(row) for row in rows]
+
+    def count(self, owner: str, category: Optional[str] = None, from_unit: Optional[str] = None,
+              to_unit: Optional[str] = None) -> int:
+        where, params = self._filters(owner, category, from_unit, to_unit)
+        return self._query(f"SELECT COUNT(*) FROM history{where}", params)[0][0]
+
+    def to_csv(self, owner: str, category: Optional[str] = None) -> str:
+        """Owner's history as CSV, oldest first, read from the database in batches"""
+        where, params = self._filters(owner, category, None, None)
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=_HISTORY_COLUMNS.split(", "))
+        writer.writeheader()
+        self.flush()
+        with self._lock:
+            cursor = self._connection.execute(
+                f"SELECT {_HISTORY_COLUMNS} FROM history{where} ORDER BY timestamp, id", params
+            )
+            cursor.row_factory = sqlite3.Row
+            while True:
+                rows = cursor.fetchmany(1000)
+                if not rows:
+                    break
+                writer.writerows(_history_entry(row) for row in rows)
+        return buffer.getvalue()
+
+    def clear(self, owner: str) -> None:
+        """Delete owner's history; other owners' rows are untouched"""
+        self.flush()
+        with self._lock:
+            self._connection.execute("DELETE FROM history WHERE owner = ?", (owner,))
+
+    def add_favorite(self, owner: str, category: str, from_unit: str, to_unit: str, value: float) -> bool:
+        """Save a favorite; returns False if owner already has it"""
+        with self._lock:
+            cursor = self._connection.execute(
+                "INSERT OR IGNORE INTO favorites (owner, created, category, from_unit, to_unit, value) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (owner, time.time(), category, from_unit, to_unit, value)
+            )
+            return cursor.rowcount > 0
+
+    def remove_favorite(self, owner: str, favorite_id: int) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM favorites WHERE id = ? AND owner = ?", (favorite_id, owner))
+
+    def favorites(self, owner: str) -> List[Dict]:
+        """Owner's saved favorites in the order they were added"""
+        rows = self._query("SELECT id, category, from_unit, to_unit, value FROM favorites WHERE owner = ? ORDER BY id",
+                           (owner,), flush=False)
+        return [dict(row) for row in rows]
+
+
+def _history_entry(row: sqlite3.Row) -> Dict:
+    entry = dict(row)
+    entry["timestamp"] = datetime.fromtimestamp(entry["timestamp"]).strftime(STORE_TIMESTAMP_FORMAT)
+    return entry
@@ -0,0 +1,181 @@
+# Conversion tables shared by the Streamlit app and batch jobs. Everything
+# here is plain Python, so importing it costs microseconds.
+
+import hashlib
+import math
+
+# Size of one unit in the category's SI unit, as an exact expression of
+# decimals joined by * and / (with ^ for powers). Every table below,
+# float or exact, is derived from these definitions.
+UNIT_DEFINITIONS = {
+    "Length": {
+        "Meter": "1",
+        "Kilometer": "1000",
+        "Centimeter": "0.01",
+        "Millimeter": "0.001",
+        "Mile": "1609.344",            # International mile
+        "Yard": "0.9144",
+        "Foot": "0.3048",
+        "Inch": "0.0254"
+    },
+    "Mass": {
+        "Kilogram": "1",
+        "Gram": "0.001",
+        "Milligram": "0.000001",
+        "Metric Ton": "1000",
+        "Pound": "0.45359237",         # International avoirdupois pound
+        "Ounce": "0.45359237/16"
+    },
+    "Area": {
+        "Square Meter": "1",
+        "Square Kilometer": "1000000",
+        "Square Mile": "1609.344^2",
+        "Square Yard": "0.9144^2",
+        "Square Foot": "0.3048^2",
+        "Square Inch": "0.0254^2",
+        "Hectare": "10000",
+        "Acre": "43560*0.3048^2"       # 43,560 square feet
+    },
+    "Volume": {
+        "Cubic Meter": "1",
+        "Liter": "0.001",
+        "Milliliter": "0.000001",
+        "Gallon": "0.003785411784",    # US liquid gallon, 231 cubic inches
+        "Quart": "0.003785411784/4",
+        "Pint": "0.003785411784/8",
+        "Cup": "0.003785411784/16"
+    },
+    "Speed": {
+        "Meters per second": "1",
+        "Kilometers per hour": "1000/3600",
+        "Miles per hour": "1609.344/3600",
+        "Knots": "1852/3600",          # One nautical mile per hour
+        "Feet per second": "0.3048"
+    },
+    "Time": {
+        "Second": "1",
+        "Minute": "60",
+        "Hour": "3600",
+        "Day": "86400",
+        "Week": "604800",
+        "Month": "2592000",            # 30 days
+        "Year": "31536000"             # 365 days
+    },
+    "Digital Storage": {
+        "Byte": "1",
+        "Kilobyte": "1024",
+        "Megabyte": "1024^2",
+        "Gigabyte": "1024^3",
+        "Terabyte": "1024^4"
+    }
+}
+
+# Temperature units as exact affine transforms of Celsius:
+# unit = celsius * scale + offset
+TEMPERATURE_DEFINITIONS = {
+    "Celsius": ("1", "0"),
+    "Fahrenheit": ("9/5", "32"),
+    "Kelvin": ("1", "273.15")
+}
+
+
+def _ratio(expression: str) -> tuple:
+    """Parse a definition such as "1609.344/3600" into a reduced (numerator, denominator)"""
+    numerator, denominator = 1, 1
+    for term in expression.replace("/", "*/").split("*"):
+        divide = term.startswith("/")
+        base, _, power = term.lstrip("/").partition("^")
+        whole, _, fraction = base.strip().partition(".")
+        term_numerator = int(whole + fraction) ** int(power or 1)
+        term_denominator = (10 ** len(fraction)) ** int(power or 1)
+        if divide:
+            term_numerator, term_denominator = term_denominator, term_numerator
+        numerator *= term_numerator
+        denominator *= term_denominator
+    divisor = math.gcd(numerator, denominator)
+    return numerator // divisor, denominator // divisor
+
+
+# Exact unit sizes as integer pairs, for the float tables below and the
+# Fraction tables in unit_converter.exact
+EXACT_SIZES = {
+    category: {unit: _ratio(expression) for unit, expression in units.items()}
+    for category, units in UNIT_DEFINITIONS.items()
+}
+EXACT_TEMPERATURES = {
+    unit: (_ratio(scale), _ratio(offset)) for unit, (scale, offset) in TEMPERATURE_DEFINITIONS.items()
+}
+
+
+def _units_per_base(category: str) -> dict:
+    # int / int is correctly rounded, so each factor is the closest float to the exact value
+    return {unit: denominator / numerator for unit, (numerator, denominator) in EXACT_SIZES[category].items()}
+
+
+# Conversion dictionaries: units per base unit, in the order the UI lists them
+CONVERSION_FACTORS = {
+    "Length": _units_per_base("Length"),
+    "Mass": _units_per_base("Mass"),
+    "Temperature": {
+        "Celsius": "C",
+        "Fahrenheit": "F",
+        "Kelvin": "K"
+    },
+    "Area": _units_per_base("Area"),
+    "Volume": _units_per_base("Volume"),
+    "Speed": _units_per_base("Speed"),
+    "Time": _units_per_base("Time"),
+    "Digital Storage": _units_per_base("Digital Storage")
+}
+
+# Changes whenever the tables above change, so caches of converted values
+# can include it in their keys
+TABLES_VERSION = hashlib.sha1(repr((UNIT_DEFINITIONS, TEMPERATURE_DEFINITIONS)).encode("utf-8")).hexdigest()[:16]
+
+# Category name -> integer ID, and the reverse, in CONVERSION_FACTORS order
+CATEGORIES = tuple(CONVERSION_FACTORS)
+CATEGORY_IDS = {category: category_id for category_id, category in enumerate(CATEGORIES)}
+
+# Unit name -> integer ID within its category, in CONVERSION_FACTORS order
+UNIT_IDS = {
+    category: {unit: unit_id for unit_id, unit in enumerate(units)}
+    for category, units in CONVERSION_FACTORS.items()
+}
+
+
+def _build_tables():
+    """Unit x unit tables: converted = value * SCALES[from][to] + OFFSETS[from][to]
+
+    Each pair's factor is worked out exactly in integers and rounded to a
+    float once, so a conversion is a single multiply (and one add for
+    temperature) by the closest float to the true factor. Only temperature
+    needs offsets. The rows are tuples of floats so the scalar path needs
+    no NumPy; the array path turns them into matrices.
+    """
+    scales, offsets = {}, {}
+    for category, sizes in EXACT_SIZES.items():
+        pairs = list(sizes.values())
+        # from -> to factor = size_from / size_to
+        scales[category] = tuple(
+            tuple(from_n * to_d / (from_d * to_n) for to_n, to_d in pairs) for from_n, from_d in pairs
+        )
+
+    pairs = list(EXACT_TEMPERATURES.values())
+    scales["Temperature"] = tuple(
+        tuple(to_scale[0] * from_scale[1] / (to_scale[1] * from_scale[0]) for to_scale, _ in pairs)
+        for from_scale, _ in pairs
+    )
+    # offset = to_offset - from_offset * to_scale / from_scale, over one common denominator
+    offsets["Temperature"] = tuple(
+        tuple(
+            (to_offset[0] * from_offset[1] * to_scale[1] * from_scale[0]
+             - from_offset[0] * to_scale[0] * from_scale[1] * to_offset[1])
+            / (to_offset[1] * from_offset[1] * to_scale[1] * from_scale[0])
+            for to_scale, to_offset in pairs
+        )
+        for from_scale, from_offset in pairs
+    )
+    return {category: scales[category] for category in CATEGORIES}, offsets
+
+
+SCALES, OFFSETS = _build_tables()
@@ -1,6 +1,8 @@
 import streamlit as st
 import plotly.graph_objects as go
-from password_utils import PasswordStrengthMeter
+from crack_time import GuessEstimator
+from passphrase import DEFAULT_WORD_LIST, PassphraseGenerator
+from password_utils import IncrementalAnalyzer, PasswordStrengthMeter, get_meter
 import time
 import pyperclip
 
@@ -176,8 +178,21 @@ with st.sidebar:
     """, unsafe_allow_html=True)
     st.markdown("<hr style='margin: 30px 0;'>", unsafe_allow_html=True)
 
-# Initialize the password meter
-password_meter = PasswordStrengthMeter()
+# Shared password meter, built once per process instead of on every rerun.
+# No result cache: the page scores through each session's incremental
+# analyzer, which never consults it, and keying a cache would mean hashing
+# the whole password on every keystroke.
+@st.cache_resource
+def load_password_meter() -> PasswordStrengthMeter:
+    return get_meter()
+
+password_meter = load_password_meter()
+
+@st.cache_resource
+def load_guess_estimator() -> GuessEstimator:
+    return GuessEstimator(password_meter)
+
+guess_estimator = load_guess_estimator()
 
 # Main content
 st.markdown('<h1 class="header-style">🔒 Password Strength Meter</h1>', unsafe_allow_html=True)
@@ -189,31 +204,71 @@ password = st.text_input("", type="password", help="Type or paste your password
 # Password generator section
 st.markdown('<div class="section-title">🎲 Password Generator</div>', unsafe_allow_html=True)
 
-# Generator controls
-col1, col2 = st.columns([2, 1])
-with col1:
-    password_length = st.slider(
-        "Password Length",
-        min_value=12,
-        max_value=32,
-        value=16,
-        step=1,
-        help="Longer passwords are more secure. We recommend at least 12 characters."
-    )
-with col2:
-    include_special = st.checkbox(
-        "Special Characters",
-        value=True,
-        help="Include special characters (!@#$%^&*) for stronger passwords"
+# Passphrase mode is offered when a word list is installed next to the app
+@st.cache_resource
+def load_passphrase_generator():
+    return PassphraseGenerator(DEFAULT_WORD_LIST) if DEFAULT_WORD_LIST.exists() else None
+
+passphrase_generator = load_passphrase_generator()
+generator_mode = "Random Characters"
+if passphrase_generator is not None:
+    generator_mode = st.radio(
+        "Generator Type",
+        ["Random Characters", "Passphrase"],
+        horizontal=True,
+        help="Passphrases are random words from a word list: easier to type, just as strong"
     )
 
-# Generate button with loading state
-if st.button("Generate Strong Password", use_container_width=True):
-    with st.spinner("Generating secure password..."):
-        time.sleep(0.5)  # Add slight delay for better UX
-        generated_password = password_meter.generate_password(password_length, include_special)
-        st.code(generated_password, language=None)
-        st.success("Password generated! Click to copy and use it in the password field above.")
+if generator_mode == "Passphrase":
+    # Passphrase controls
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        passphrase_words = st.slider(
+            "Number of Words",
+            min_value=4,
+            max_value=10,
+            value=6,
+            step=1,
+            help="Each extra word multiplies the number of possible passphrases."
+        )
+    with col2:
+        passphrase_number = st.checkbox(
+            "Add a Number",
+            value=False,
+            help="Append a random digit to the passphrase"
+        )
+
+    if st.button("Generate Passphrase", use_container_width=True):
+        phrase, phrase_entropy = passphrase_generator.generate(passphrase_words, include_number=passphrase_number)
+        st.code(phrase, language=None)
+        st.success(f"Passphrase generated with {phrase_entropy:.1f} bits of entropy "
+                   f"({len(passphrase_generator.words):,}-word list).")
+else:
+    # Generator controls
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        password_length = st.slider(
+            "Password Length",
+            min_value=12,
+            max_value=32,
+            value=16,
+            step=1,
+            help="Longer passwords are more secure. We recommend at least 12 characters."
+        )
+    with col2:
+        include_special = st.checkbox(
+            "Special Characters",
+            value=True,
+            help="Include special characters (!@#$%^&*) for stronger passwords"
+        )
+
+    # Generate button with loading state
+    if st.button("Generate Strong Password", use_container_width=True):
+        with st.spinner("Generating secure password..."):
+            time.sleep(0.5)  # Add slight delay for better UX
+            generated_password = password_meter.generate_password(password_length, include_special)
+            st.code(generated_password, language=None)
+            st.success("Password generated! Click to copy and use it in the password field above.")
 st.markdown('</div>', unsafe_allow_html=True)
 
 # Password requirements section with tooltips
@@ -226,9 +281,14 @@ st.markdown("""
 """, unsafe_allow_html=True)
 st.markdown('</div>', unsafe_allow_html=True)
 
+# Per-session incremental analyzer, so each keystroke only processes the edit
+if st.session_state.get("password_analyzer") is None or st.session_state.password_analyzer.meter is not password_meter:
+    st.session_state.password_analyzer = IncrementalAnalyzer(password_meter)
+st.session_state.password_analyzer.set_text(password)
+
 # Analyze password when input is provided
 if password:
-    result = password_meter.check_password_strength(password)
+    result = st.session_state.password_analyzer.result()
 
     # Create gauge chart for password strength
     fig = go.Figure(go.Indicator(
@@ -274,7 +334,7 @@ if password:
     """, unsafe_allow_html=True)
 
     # Feedback and Analysis in tabs
-    tab1, tab2 = st.tabs(["📝 Feedback", "🔍 Analysis"])
+    tab1, tab2, tab3 = st.tabs(["📝 Feedback", "🔍 Analysis", "⏱️ Crack Time"])
 
     with tab1:
         if result["feedback"]:
@@ -302,6 +362,23 @@ if password:
                 </div>
                 """, unsafe_allow_html=True)
 
+    with tab3:
+        estimate = guess_estimator.estimate(password)
+        st.markdown(f"<p><strong>Estimated guesses:</strong> 10<sup>{estimate['guesses_log10']:.1f}</sup></p>",
+                    unsafe_allow_html=True)
+        scenarios = {
+            "online_throttled": "Online attack, rate limited (100/hour)",
+            "online_unthrottled": "Online attack, no rate limit (10/second)",
+            "offline_slow_hash": "Offline attack, slow hash (10k/second)",
+            "offline_fast_hash": "Offline attack, fast hash (10B/second)"
+        }
+        for key, label in scenarios.items():
+            st.markdown(f"""
+            <div class='feedback-item'>
+                ⏱️ {label}: <strong>{estimate["crack_times_display"][key]}</strong>
+            </div>
+            """, unsafe_allow_html=True)
+
 # Footer with version and helpful links
 st.markdown("---")
 st.markdown("""
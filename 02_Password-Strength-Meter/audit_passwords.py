@@ -0,0 +1,116 @@
+import argparse
+import csv
+import json
+import sys
+import time
+from collections import Counter, deque
+from typing import Dict, Iterable, Iterator, List, TextIO
+
+from parallel_scoring import ParallelScorer
+
+DETAIL_KEYS = ("length", "uppercase", "lowercase", "digits", "special")
+
+
+def read_passwords(stream: TextIO) -> Iterator[str]:
+    """Yield one password per line, keeping everything except the line ending"""
+    for line in stream:
+        yield line.rstrip("\r\n")
+
+
+class ResultWriter:
+    """Writes scored rows as CSV or JSON Lines"""
+
+    def __init__(self, stream: TextIO, output_format: str, include_password: bool):
+        self.stream = stream
+        self.output_format = output_format
+        self.include_password = include_password
+        fields = ["line"] + (["password"] if include_password else []) + [
+            "score", "strength", "entropy", "length"
+        ] + [f"has_{key}" for key in DETAIL_KEYS] + ["feedback"]
+        if output_format == "csv":
+            self._csv = csv.DictWriter(stream, fieldnames=fields)
+            self._csv.writeheader()
+
+    def write(self, line_number: int, password: str, result: Dict) -> None:
+        row = {"line": line_number}
+        if self.include_password:
+            row["password"] = password
+        row.update({
+            "score": round(result["score"], 4),
+            "strength": result["strength"],
+            "entropy": round(result["entropy"], 4),
+            "length": result["length"]
+        })
+        for key in DETAIL_KEYS:
+            row[f"has_{key}"] = result["details"].get(key)
+
+        if self.output_format == "csv":
+            row["feedback"] = " | ".join(result["feedback"])
+            self._csv.writerow(row)
+        else:
+            row["feedback"] = result["feedback"]
+            self.stream.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Score a password file line by line and write the results as CSV or JSON Lines"
+    )
+    parser.add_argument("input", nargs="?", default="-", help="Password file, one per line (default: stdin)")
+    parser.add_argument("-o", "--output", default="-", help="Output file (default: stdout)")
+    parser.add_argument("-f", "--format", choices=("csv", "jsonl"), default="csv", help="Output format (default: csv)")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="Scoring processes (default: 1)")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Passwords sent to a worker at a time (default: 1000)")
+    parser.add_argument("--policy", help="Scoring policy file (.json or .toml) overriding the default rules")
+    parser.add_argument("--include-password", action="store_true",
+                        help="Include the plaintext password in each row (off by default)")
+    parser.add_argument("--progress-interval", type=float, default=5.0,
+                        help="Seconds between progress reports on stderr, 0 to disable (default: 5)")
+    args = parser.parse_args(argv)
+
+    if args.workers < 1 or args.chunk_size < 1:
+        parser.error("--workers and --chunk-size must be at least 1")
+
+    source = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8", errors="replace")
+    output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+
+    strengths = Counter()
+    start = last_report = time.perf_counter()
+    count = 0
+    try:
+        writer = ResultWriter(output, args.format, args.include_password)
+        # The same password stream feeds the scorer and the writer; tee it
+        # through a bounded buffer so rows keep their plaintext when requested
+        passwords = deque()
+
+        def remember(stream: Iterable[str]) -> Iterator[str]:
+            for password in stream:
+                passwords.append(password)
+                yield password
+
+        with ParallelScorer(args.workers, args.chunk_size, policy=args.policy) as scorer:
+            for result in scorer.score(remember(read_passwords(source))):
+                count += 1
+                writer.write(count, passwords.popleft(), result)
+                strengths[result["strength"]] += 1
+
+                now = time.perf_counter()
+                if args.progress_interval and now - last_report >= args.progress_interval:
+                    elapsed = now - start
+                    print(f"{count:,} passwords scored ({count / elapsed:,.0f}/s)", file=sys.stderr)
+                    last_report = now
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if output is not sys.stdout:
+            output.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"Done: {count:,} passwords in {elapsed:.1f}s ({count / max(elapsed, 1e-9):,.0f}/s)", file=sys.stderr)
+    for strength, total in strengths.most_common():
+        print(f"  {strength}: {total:,}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
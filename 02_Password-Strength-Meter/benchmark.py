@@ -0,0 +1,200 @@
+import argparse
+import json
+import os
+import platform
+import random
+import string
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+import password_utils
+from password_utils import PasswordStrengthMeter
+
+ALPHABET = string.ascii_letters + string.digits + "!@#$%^&*"
+PASSWORD_LENGTHS = {"short": 8, "typical": 16, "long": 1000}
+WORD_LIST_SIZES = [25, 1_000, 100_000, 1_000_000]
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process so far"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def make_passwords(count: int, length: int, seed: int) -> List[str]:
+    rng = random.Random(seed)
+    return ["".join(rng.choice(ALPHABET) for _ in range(length)) for _ in range(count)]
+
+
+def measure(name: str, func: Callable[[], object], iterations: int, ops_per_call: int = 1) -> Dict:
+    """Time each call separately and summarize throughput and latency"""
+    func()  # Warm-up
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter_ns()
+        func()
+        timings.append(time.perf_counter_ns() - start)
+    timings.sort()
+    total = sum(timings)
+    return {
+        "name": name,
+        "iterations": iterations,
+        "ops_per_sec": round(iterations * ops_per_call / (total / 1e9), 1),
+        "p50_us": round(timings[len(timings) // 2] / 1000, 2),
+        "p99_us": round(timings[min(len(timings) - 1, int(len(timings) * 0.99))] / 1000, 2),
+        "peak_rss_mb": peak_rss_mb()
+    }
+
+
+def run_hot_paths(iterations: int, batch_size: int, seed: int) -> List[Dict]:
+    meter = PasswordStrengthMeter()
+    results = []
+
+    for label, length in PASSWORD_LENGTHS.items():
+        count = max(1, iterations if length < 100 else iterations // 10)
+        passwords = make_passwords(count, length, seed)
+        cycle = iter(passwords * 2)
+        results.append(measure(f"check_password_strength[{label}]",
+                               lambda: meter.check_password_strength(next(cycle)), count))
+        cycle = iter(passwords * 2)
+        results.append(measure(f"calculate_entropy[{label}]",
+                               lambda: meter.calculate_entropy(next(cycle)), count))
+
+    batch = make_passwords(batch_size, PASSWORD_LENGTHS["typical"], seed)
+    results.append(measure(f"single_calls[{batch_size}]",
+                           lambda: [meter.check_password_strength(p) for p in batch], 5, batch_size))
+    results.append(measure(f"check_many[{batch_size}]", lambda: meter.check_many(batch), 5, batch_size))
+
+    results.append(measure("generate_password", meter.generate_password, iterations))
+    results.append(measure(f"generate_many[{batch_size}]",
+                           lambda: meter.generate_many(batch_size), 5, batch_size))
+    return results
+
+
+def run_word_list(size: int, seed: int) -> Dict:
+    """Load a synthetic word list of the given size in a fresh process"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        word_list = Path(tmp_dir) / "common_passwords.txt"
+        rng = random.Random(seed)
+        with open(word_list, "w") as f:
+            for _ in range(size):
+                f.write(rng.randbytes(5).hex() + "\n")
+        output = subprocess.run(
+            [sys.executable, __file__, "--load-word-list", str(word_list)],
+            check=True, capture_output=True, text=True, cwd=Path(__file__).parent
+        ).stdout
+    result = json.loads(output)
+    result["name"] = f"_load_common_passwords[{size}]"
+    return result
+
+
+def load_word_list(path: str) -> None:
+    """Child-process side of run_word_list: time _load_common_passwords alone"""
+    password_utils.COMMON_PASSWORDS_FILE = Path(path)
+    meter = PasswordStrengthMeter(breach_index=None, bloom_filter=None)
+    start = time.perf_counter()
+    words = meter._load_common_passwords()
+    elapsed = time.perf_counter() - start
+    print(json.dumps({
+        "name": "_load_common_passwords",
+        "words": len(words),
+        "iterations": 1,
+        "ops_per_sec": round(1 / elapsed, 3),
+        "p50_us": round(elapsed * 1e6, 1),
+        "p99_us": round(elapsed * 1e6, 1),
+        "peak_rss_mb": peak_rss_mb()
+    }))
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True, cwd=Path(__file__).parent).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: List[Dict], baseline_path: str, max_regression: float) -> bool:
+    """Print throughput changes against a saved run; False if anything regressed too far"""
+    with open(baseline_path) as f:
+        baseline = {row["name"]: row for row in json.load(f)["results"]}
+
+    ok = True
+    print(f"\n{'benchmark':<40} {'baseline':>12} {'current':>12} {'change':>8}")
+    for row in results:
+        old = baseline.get(row["name"])
+        if old is None:
+            continue
+        change = (row["ops_per_sec"] - old["ops_per_sec"]) / old["ops_per_sec"] * 100
+        flag = ""
+        if change < -max_regression:
+            flag = "  REGRESSION"
+            ok = False
+        print(f"{row['name']:<40} {old['ops_per_sec']:>12,.0f} {row['ops_per_sec']:>12,.0f} {change:>+7.1f}%{flag}")
+    return ok
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark PasswordStrengthMeter hot paths")
+    parser.add_argument("-o", "--output", help="Write results as JSON to this file")
+    parser.add_argument("--iterations", type=int, default=2000, help="Calls per single-password benchmark (default: 2000)")
+    parser.add_argument("--batch-size", type=int, default=10_000, help="Passwords per batch benchmark (default: 10000)")
+    parser.add_argument("--word-list-sizes", type=int, nargs="*", default=WORD_LIST_SIZES,
+                        help="Synthetic word-list sizes to load, e.g. 25 1000 10000000")
+    parser.add_argument("--seed", type=int, default=1234, help="Seed for the synthetic inputs (default: 1234)")
+    parser.add_argument("--compare", metavar="BASELINE", help="Compare against a previous JSON result")
+    parser.add_argument("--max-regression", type=float, default=10.0,
+                        help="Allowed throughput drop in percent when comparing (default: 10)")
+    parser.add_argument("--load-word-list", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.load_word_list:
+        load_word_list(args.load_word_list)
+        return 0
+
+    results = run_hot_paths(args.iterations, args.batch_size, args.seed)
+    for size in args.word_list_sizes:
+        results.append(run_word_list(size, args.seed))
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "iterations": args.iterations,
+            "batch_size": args.batch_size,
+            "seed": args.seed
+        },
+        "results": results
+    }
+
+    print(f"{'benchmark':<40} {'ops/sec':>12} {'p50 us':>10} {'p99 us':>10} {'peak RSS MB':>12}")
+    for row in results:
+        rss = f"{row['peak_rss_mb']:.1f}" if row["peak_rss_mb"] is not None else "n/a"
+        print(f"{row['name']:<40} {row['ops_per_sec']:>12,.1f} {row['p50_us']:>10,.1f} {row['p99_us']:>10,.1f} {rss:>12}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare and not compare(results, args.compare, args.max_regression):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
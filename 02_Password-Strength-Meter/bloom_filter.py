@@ -0,0 +1,161 @@
+import argparse
+import hashlib
+import math
+import mmap
+import os
+import struct
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, Union
+
+# Header: magic, size in bits, number of hash functions, number of items added
+_HEADER = struct.Struct("<8sQIQ")
+_MAGIC = b"PWBLOOM\x01"
+
+
+class BloomFilter:
+    """Probabilistic pre-check for common-password membership
+
+    A miss means the password is definitely not in the list the filter was
+    built from; a hit means it might be, and the exact store has to be asked.
+    Saved filters are memory-mapped on load, so even a filter covering a
+    100M-entry breach list is ready in milliseconds.
+    """
+
+    def __init__(self, size_bits: int, num_hashes: int):
+        if size_bits < 8 or num_hashes < 1:
+            raise ValueError("A Bloom filter needs at least 8 bits and 1 hash function")
+        self.size_bits = size_bits
+        self.num_hashes = num_hashes
+        self.count = 0
+        self._bits: Union[bytearray, mmap.mmap] = bytearray((size_bits + 7) // 8)
+        self._offset = 0
+
+    @classmethod
+    def for_capacity(cls, capacity: int, false_positive_rate: float = 0.001) -> "BloomFilter":
+        """Size a filter for the expected number of items and false positive rate"""
+        if not 0 < false_positive_rate < 1:
+            raise ValueError("False positive rate must be between 0 and 1")
+        capacity = max(1, capacity)
+        size_bits = math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2)
+        num_hashes = max(1, round(size_bits / capacity * math.log(2)))
+        return cls(max(8, size_bits), num_hashes)
+
+    def _positions(self, password: str) -> Iterable[int]:
+        """Bit positions for a normalized password using double hashing"""
+        digest = hashlib.blake2b(password.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        size = self.size_bits
+        return ((h1 + i * h2) % size for i in range(self.num_hashes))
+
+    def add(self, password: str) -> None:
+        bits = self._bits
+        if not isinstance(bits, bytearray):
+            raise TypeError("Filters loaded from disk are read-only")
+        for position in self._positions(password.lower()):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, password: str) -> bool:
+        bits = self._bits
+        offset = self._offset
+        for position in self._positions(password.lower()):
+            if not bits[offset + (position >> 3)] & (1 << (position & 7)):
+                return False
+        return True
+
+    def false_positive_rate(self) -> float:
+        """Expected false positive rate for the items added so far"""
+        if not self.count:
+            return 0.0
+        return (1 - math.exp(-self.num_hashes * self.count / self.size_bits)) ** self.num_hashes
+
+    def report(self) -> Dict[str, Union[int, float]]:
+        """Size and accuracy figures for logs and the CLI"""
+        return {
+            "items": self.count,
+            "size_bits": self.size_bits,
+            "size_bytes": (self.size_bits + 7) // 8,
+            "num_hashes": self.num_hashes,
+            "bits_per_item": self.size_bits / max(1, self.count),
+            "false_positive_rate": self.false_positive_rate()
+        }
+
+    def save(self, path: Union[str, Path]) -> None:
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, self.size_bits, self.num_hashes, self.count))
+            f.write(self._bits[self._offset:self._offset + (self.size_bits + 7) // 8])
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "BloomFilter":
+        """Memory-map a saved filter without reading it into memory"""
+        with open(path, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, size_bits, num_hashes, count = _HEADER.unpack_from(data, 0)
+        if magic != _MAGIC:
+            data.close()
+            raise ValueError(f"{path} is not a Bloom filter file")
+        if len(data) != _HEADER.size + (size_bits + 7) // 8:
+            data.close()
+            raise ValueError(f"{path} is truncated or corrupt")
+
+        bloom = cls.__new__(cls)
+        bloom.size_bits = size_bits
+        bloom.num_hashes = num_hashes
+        bloom.count = count
+        bloom._bits = data
+        bloom._offset = _HEADER.size
+        return bloom
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Build or inspect a Bloom filter over a common-password list"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="Build a filter from a text file (one password per line)")
+    build.add_argument("source", help="Password list, or - for stdin (requires --capacity)")
+    build.add_argument("output", help="Filter file to write, e.g. common_passwords.bloom")
+    build.add_argument("--fp-rate", type=float, default=0.001,
+                       help="Target false positive rate (default: 0.001)")
+    build.add_argument("--capacity", type=int,
+                       help="Expected number of passwords (default: count the lines of source)")
+
+    info = commands.add_parser("info", help="Report the size and false positive rate of a filter")
+    info.add_argument("filter", help="Filter file")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "info":
+        bloom = BloomFilter.load(args.filter)
+    else:
+        capacity = args.capacity
+        if capacity is None:
+            if args.source == "-":
+                parser.error("--capacity is required when reading from stdin")
+            with open(args.source, "rb") as f:
+                capacity = sum(1 for _ in f)
+
+        bloom = BloomFilter.for_capacity(capacity, args.fp_rate)
+        source = sys.stdin if args.source == "-" else open(args.source, "r", encoding="utf-8", errors="replace")
+        try:
+            for line in source:
+                password = line.strip()
+                if password:
+                    bloom.add(password)
+        finally:
+            if source is not sys.stdin:
+                source.close()
+        bloom.save(args.output)
+        print(f"Wrote {args.output} ({os.path.getsize(args.output) / 1024 / 1024:.1f} MiB)")
+
+    for key, value in bloom.report().items():
+        print(f"{key}: {value:.6g}" if isinstance(value, float) else f"{key}: {value:,}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+import argparse
+import hashlib
+import heapq
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator, List, Union
+
+# Header: magic, digest width in bytes, number of records
+_HEADER = struct.Struct("<8sII")
+_MAGIC = b"PWIDX\x00\x00\x01"
+
+
+def password_digest(password: str, width: int) -> bytes:
+    """SHA-1 prefix stored in the index for an already-normalized password"""
+    return hashlib.sha1(password.encode("utf-8")).digest()[:width]
+
+
+class BreachIndex:
+    """Memory-mapped set of breached passwords stored as sorted SHA-1 prefixes
+
+    The index file holds fixed-width SHA-1 prefixes of lower-cased passwords
+    in ascending order, so a lookup is a binary search over the mapped file
+    and only touches O(log n) pages. Nothing is loaded into memory up front,
+    which keeps startup instant even for 100M-entry breach corpora.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self.width, self.count = _HEADER.unpack_from(self._map, 0)
+        if magic != _MAGIC:
+            self._map.close()
+            raise ValueError(f"{self.path} is not a password index file")
+        if len(self._map) != _HEADER.size + self.width * self.count:
+            self._map.close()
+            raise ValueError(f"{self.path} is truncated or corrupt")
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, password: str) -> bool:
+        return self.contains_digest(password_digest(password.lower(), self.width))
+
+    def contains_digest(self, digest: bytes) -> bool:
+        """Binary search the mapped records for a digest prefix"""
+        width = self.width
+        data = self._map
+        low, high = 0, self.count
+        while low < high:
+            mid = (low + high) // 2
+            offset = _HEADER.size + mid * width
+            record = data[offset:offset + width]
+            if record < digest:
+                low = mid + 1
+            elif record > digest:
+                high = mid
+            else:
+                return True
+        return False
+
+    def close(self) -> None:
+        self._map.close()
+
+    def __enter__(self) -> "BreachIndex":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @classmethod
+    def build(cls, passwords: Iterable[str], output: Union[str, Path], width: int = 8,
+              chunk_size: int = 5_000_000) -> int:
+        """Build an index file from plain-text passwords and return its record count
+
+        Passwords are normalized like common_passwords.txt (stripped and
+        lower-cased). Digests are sorted in chunks of chunk_size entries that
+        are spilled to temporary files and merged, so memory stays bounded no
+        matter how large the input list is.
+        """
+        if not 4 <= width <= 20:
+            raise ValueError("Digest width must be between 4 and 20 bytes")
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            runs: List[Path] = []
+            chunk: List[bytes] = []
+            for line in passwords:
+                password = line.strip().lower()
+                if not password:
+                    continue
+                chunk.append(password_digest(password, width))
+                if len(chunk) >= chunk_size:
+                    runs.append(_write_run(chunk, tmp_dir, len(runs)))
+                    chunk = []
+            if chunk or not runs:
+                runs.append(_write_run(chunk, tmp_dir, len(runs)))
+
+            run_files = [open(run, "rb") for run in runs]
+            try:
+                with open(output, "wb") as out:
+                    out.write(_HEADER.pack(_MAGIC, width, 0))
+                    count = 0
+                    previous = None
+                    merged = heapq.merge(*(_read_records(f, width) for f in run_files))
+                    for record in merged:
+                        if record != previous:
+                            out.write(record)
+                            count += 1
+                            previous = record
+                    out.seek(0)
+                    out.write(_HEADER.pack(_MAGIC, width, count))
+            finally:
+                for f in run_files:
+                    f.close()
+
+        return count
+
+
+def _write_run(chunk: List[bytes], tmp_dir: str, number: int) -> Path:
+    """Sort one chunk of digests and spill it to a temporary file"""
+    path = Path(tmp_dir) / f"run-{number}.bin"
+    chunk.sort()
+    with open(path, "wb") as f:
+        f.write(b"".join(chunk))
+    return path
+
+
+def _read_records(f: BinaryIO, width: int, batch: int = 65536) -> Iterator[bytes]:
+    """Yield fixed-width records from a sorted run file"""
+    while True:
+        block = f.read(width * batch)
+        if not block:
+            return
+        for offset in range(0, len(block), width):
+            yield block[offset:offset + width]
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Build or query a memory-mapped breached-password index"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="Build an index from a text file (one password per line)")
+    build.add_argument("source", help="Password list, or - for stdin")
+    build.add_argument("output", help="Index file to write, e.g. common_passwords.idx")
+    build.add_argument("--width", type=int, default=8, help="Bytes of SHA-1 kept per entry (default: 8)")
+    build.add_argument("--chunk-size", type=int, default=5_000_000,
+                       help="Entries sorted in memory at a time (default: 5000000)")
+
+    query = commands.add_parser("query", help="Check whether passwords are in an index")
+    query.add_argument("index", help="Index file")
+    query.add_argument("passwords", nargs="+")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        if args.source == "-":
+            source = sys.stdin
+        else:
+            source = open(args.source, "r", encoding="utf-8", errors="replace")
+        try:
+            count = BreachIndex.build(source, args.output, args.width, args.chunk_size)
+        finally:
+            if source is not sys.stdin:
+                source.close()
+        size = os.path.getsize(args.output)
+        print(f"Wrote {count:,} entries to {args.output} ({size / 1024 / 1024:.1f} MiB)")
+        return 0
+
+    with BreachIndex(args.index) as index:
+        for password in args.passwords:
+            print(f"{password}\t{'found' if password in index else 'not found'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
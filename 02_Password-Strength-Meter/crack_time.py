@@ -0,0 +1,242 @@
+import argparse
+import math
+import sys
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Union
+
+from password_utils import COMMON_PASSWORDS, COMMON_PASSWORDS_FILE, PasswordStrengthMeter, get_meter
+
+# Guesses per second for common attack scenarios
+DEFAULT_HASH_RATES = {
+    "online_throttled": 100 / 3600,   # Rate-limited login form
+    "online_unthrottled": 10,         # Login form without rate limiting
+    "offline_slow_hash": 1e4,         # bcrypt/scrypt/Argon2 on a GPU rig
+    "offline_fast_hash": 1e10         # Unsalted MD5/SHA-1 on a GPU rig
+}
+
+# Each pattern segment costs one extra bit for the attacker having to guess
+# how the password is split up
+_SEGMENT_PENALTY_BITS = 1.0
+
+
+def format_duration(seconds: float) -> str:
+    """Human-friendly crack time such as '3 hours' or 'centuries'"""
+    if seconds < 1:
+        return "less than a second"
+    for unit, size in (("year", 31536000), ("month", 2592000), ("day", 86400),
+                       ("hour", 3600), ("minute", 60), ("second", 1)):
+        if seconds >= size:
+            amount = seconds / size
+            if unit == "year" and amount >= 100:
+                return "centuries"
+            amount = round(amount)
+            return f"{amount} {unit}{'' if amount == 1 else 's'}"
+    return "less than a second"
+
+
+class GuessEstimator:
+    """Estimates how many guesses an attacker needs for a password
+
+    The password is split into the cheapest sequence of segments with a
+    dynamic-programming search: dictionary words (ranked by their position
+    in the common-password list), known patterns such as keyboard walks,
+    repeated characters, alphabetic/numeric sequences, and brute force for
+    anything else. Each end position only looks back max_token_length
+    characters, so the search is linear in the password length.
+    """
+
+    def __init__(self, meter: Optional[PasswordStrengthMeter] = None,
+                 ranked_words: Optional[Iterable[str]] = None,
+                 hash_rates: Optional[Dict[str, float]] = None,
+                 max_ranked_words: int = 1_000_000,
+                 max_token_length: int = 32):
+        self.meter = meter or get_meter()
+        self.hash_rates = dict(hash_rates or DEFAULT_HASH_RATES)
+        self.max_token_length = max_token_length
+
+        # Rank = position in the list, which is how breach lists are ordered.
+        # The built-in list has no order, so its words share its size as rank.
+        if ranked_words is None and COMMON_PASSWORDS_FILE.exists():
+            with open(COMMON_PASSWORDS_FILE, "r", encoding="utf-8", errors="replace") as f:
+                self.ranks = self._rank(islice(f, max_ranked_words))
+        else:
+            self.ranks = self._rank(islice(ranked_words or (), max_ranked_words))
+        for word in COMMON_PASSWORDS:
+            self.ranks.setdefault(word, len(COMMON_PASSWORDS))
+
+        # Literal patterns from the meter (keyboard walks and the like),
+        # guessed by trying every pattern in their group
+        self.pattern_guesses: Dict[str, int] = {}
+        matcher = self.meter.pattern_matcher
+        for group in matcher.groups:
+            patterns = matcher.patterns(group)
+            for pattern in patterns:
+                pattern = pattern.lower()
+                self.pattern_guesses[pattern] = min(len(patterns), self.pattern_guesses.get(pattern, len(patterns)))
+
+    @staticmethod
+    def _rank(words: Iterable[str]) -> Dict[str, int]:
+        ranks = {}
+        for word in words:
+            word = word.strip().lower()
+            if word and word not in ranks:
+                ranks[word] = len(ranks) + 1
+        return ranks
+
+    def _cardinality(self, password: str) -> int:
+        """Brute-force alphabet size, sized like calculate_entropy's charset"""
+        classes = self.meter._analyze(password)["classes"]
+        size = 0
+        if classes["lowercase"]: size += 26
+        if classes["uppercase"]: size += 26
+        if classes["digits"]: size += 10
+        if classes["special"]: size += len(self.meter.special_chars)
+        # Anything else (spaces, other punctuation, non-ASCII) widens the search
+        if sum(classes.values()) < len(password):
+            size += 33
+        return max(size, 1)
+
+    def _dictionary_guesses(self, token: str) -> Optional[int]:
+        lowered = token.lower()
+        rank = self.ranks.get(lowered)
+        if rank is None:
+            rank = self.pattern_guesses.get(lowered)
+        if rank is None and len(token) >= 4:
+            index = self.meter.breach_index
+            if index is not None and lowered in index:
+                rank = len(index)
+        if rank is None:
+            return None
+        return rank * _case_variations(token)
+
+    def estimate(self, password: str) -> Dict[str, Union[float, list, dict]]:
+        """Minimum guesses over all decompositions, plus crack times per scenario"""
+        length = len(password)
+        if not length:
+            guesses = 1.0
+            sequence = []
+        else:
+            brute_bits = math.log2(self._cardinality(password))
+            max_token = self.max_token_length
+
+            # Where the run of repeated characters / the +-1 sequence ending at each position starts
+            repeat_start = [0] * length
+            sequence_start = [0] * length
+            for j in range(1, length):
+                repeat_start[j] = repeat_start[j - 1] if password[j] == password[j - 1] else j
+                delta = ord(password[j]) - ord(password[j - 1])
+                if delta not in (1, -1):
+                    sequence_start[j] = j
+                elif j >= 2 and ord(password[j - 1]) - ord(password[j - 2]) == delta:
+                    sequence_start[j] = sequence_start[j - 1]
+                else:
+                    sequence_start[j] = j - 1
+
+            best = [0.0] + [math.inf] * length  # Cheapest log2(guesses) for password[:j]
+            choice = [("", 0, 0.0)] * (length + 1)  # Pattern, start, log2(guesses) of the last segment
+            for j in range(1, length + 1):
+                best[j] = best[j - 1] + brute_bits
+                choice[j] = ("bruteforce", j - 1, brute_bits)
+
+                for i in range(max(0, j - max_token), j):
+                    token = password[i:j]
+                    candidates = []
+                    dictionary = self._dictionary_guesses(token)
+                    if dictionary is not None:
+                        candidates.append(("dictionary", dictionary))
+                    if j - i >= 3 and repeat_start[j - 1] <= i:
+                        candidates.append(("repeat", _cardinality_of(token[0]) * (j - i)))
+                    if j - i >= 3 and sequence_start[j - 1] <= i:
+                        candidates.append(("sequence", _sequence_guesses(token)))
+
+                    for pattern, pattern_guesses in candidates:
+                        bits = math.log2(max(pattern_guesses, 1)) + _SEGMENT_PENALTY_BITS
+                        if best[i] + bits < best[j]:
+                            best[j] = best[i] + bits
+                            choice[j] = (pattern, i, bits)
+
+            # Walk the choices back, merging neighbouring brute-force characters
+            sequence = []
+            j = length
+            while j > 0:
+                pattern, i, bits = choice[j]
+                if pattern == "bruteforce" and sequence and sequence[-1]["pattern"] == "bruteforce":
+                    sequence[-1]["token"] = password[i:j] + sequence[-1]["token"]
+                    sequence[-1]["guesses_log10"] += bits * math.log10(2)
+                else:
+                    sequence.append({"pattern": pattern, "token": password[i:j], "guesses_log10": bits * math.log10(2)})
+                j = i
+            sequence.reverse()
+            guesses = 2 ** min(best[length], 1023.0)
+
+        crack_times = {name: guesses / rate for name, rate in self.hash_rates.items()}
+        return {
+            "guesses": guesses,
+            "guesses_log10": math.log10(guesses),
+            "sequence": sequence,
+            "crack_times_seconds": crack_times,
+            "crack_times_display": {name: format_duration(seconds) for name, seconds in crack_times.items()}
+        }
+
+
+def _case_variations(token: str) -> int:
+    """How many capitalizations an attacker tries before reaching this one"""
+    upper = sum(1 for char in token if char.isupper())
+    lower = sum(1 for char in token if char.islower())
+    if upper == 0:
+        return 1
+    if lower == 0 or (upper == 1 and (token[0].isupper() or token[-1].isupper())):
+        return 2
+    return sum(math.comb(upper + lower, i) for i in range(1, min(upper, lower) + 1))
+
+
+def _cardinality_of(char: str) -> int:
+    if 'a' <= char <= 'z' or 'A' <= char <= 'Z':
+        return 26
+    if char.isdecimal():
+        return 10
+    return 33
+
+
+def _sequence_guesses(token: str) -> int:
+    """Sequences like 'abcd' or '9876': a start point times the length"""
+    first = token[0]
+    if first in "aAzZ019":
+        start = 4  # Obvious starting points are tried first
+    elif first.isdecimal():
+        start = 10
+    else:
+        start = 26
+    descending = ord(token[1]) < ord(token[0])
+    return start * len(token) * (2 if descending else 1)
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Estimate guesses and crack times for passwords")
+    parser.add_argument("passwords", nargs="*", help="Passwords to check (default: read lines from stdin)")
+    parser.add_argument("--rate", action="append", default=[], metavar="NAME=GUESSES_PER_SEC",
+                        help="Add or override an attack scenario, e.g. --rate gpu=1e11")
+    args = parser.parse_args(argv)
+
+    rates = dict(DEFAULT_HASH_RATES)
+    for item in args.rate:
+        name, _, value = item.partition("=")
+        try:
+            rate = float(value)
+        except ValueError:
+            parser.error(f"invalid --rate {item!r}")
+        if not name or not math.isfinite(rate) or rate <= 0:
+            parser.error(f"invalid --rate {item!r}: needs a name and a positive number of guesses per second")
+        rates[name] = rate
+
+    estimator = GuessEstimator(hash_rates=rates)
+    passwords = args.passwords or (line.rstrip("\r\n") for line in sys.stdin)
+    for password in passwords:
+        result = estimator.estimate(password)
+        times = ", ".join(f"{name}: {text}" for name, text in result["crack_times_display"].items())
+        print(f"{password}\t10^{result['guesses_log10']:.1f} guesses\t{times}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
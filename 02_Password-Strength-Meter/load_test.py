@@ -0,0 +1,91 @@
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import Counter
+from typing import Dict, List
+
+from benchmark import make_passwords
+
+
+async def _client(host: str, port: int, passwords: List[str], latencies: List[float], statuses: Counter) -> None:
+    """One keep-alive connection sending its share of requests back to back"""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for password in passwords:
+            body = json.dumps({"password": password}).encode("utf-8")
+            request = (f"POST /score HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                       f"Content-Length: {len(body)}\r\n\r\n").encode("latin-1") + body
+            start = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+
+            status = int((await reader.readline()).split()[1])
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                if name.lower() == "content-length":
+                    length = int(value)
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            statuses[status] += 1
+    finally:
+        writer.close()
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+async def run(host: str, port: int, requests: int, concurrency: int, seed: int) -> Dict:
+    passwords = make_passwords(requests, 16, seed)
+    latencies: List[float] = []
+    statuses = Counter()
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        _client(host, port, passwords[i::concurrency], latencies, statuses) for i in range(concurrency)
+    ))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "concurrency": concurrency,
+        "seconds": round(elapsed, 3),
+        "requests_per_sec": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(_percentile(latencies, 0.50) * 1000, 2),
+        "p90_ms": round(_percentile(latencies, 0.90) * 1000, 2),
+        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 2),
+        "max_ms": round(latencies[-1] * 1000, 2),
+        "statuses": dict(statuses)
+    }
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load-test a running scoring_service.py")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("-n", "--requests", type=int, default=10_000, help="Total requests (default: 10000)")
+    parser.add_argument("-c", "--concurrency", type=int, default=64, help="Concurrent connections (default: 64)")
+    parser.add_argument("--seed", type=int, default=1234, help="Seed for the synthetic passwords (default: 1234)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    result = asyncio.run(run(args.host, args.port, args.requests, max(1, args.concurrency), args.seed))
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(f"{result['requests']:,} requests over {result['concurrency']} connections in {result['seconds']}s "
+              f"({result['requests_per_sec']:,.1f} req/s)")
+        print(f"latency p50 {result['p50_ms']} ms, p90 {result['p90_ms']} ms, "
+              f"p99 {result['p99_ms']} ms, max {result['max_ms']} ms")
+        print("status codes: " + ", ".join(f"{code}: {count:,}" for code, count in sorted(result["statuses"].items())))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+import argparse
+import json
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+from collections import deque
+from multiprocessing import Pool
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from breach_index import BreachIndex
+from password_utils import COMMON_PASSWORDS_FILE, COMMON_PASSWORDS_INDEX, PasswordStrengthMeter, get_meter
+from scoring_policy import ScoringPolicy
+
+# Meter used by each worker process, created once by the pool initializer
+_worker_meter: Optional[PasswordStrengthMeter] = None
+
+
+def _init_worker(breach_index: Optional[str], bloom_filter: Optional[str],
+                 policy: Optional[ScoringPolicy]) -> None:
+    global _worker_meter
+    _worker_meter = PasswordStrengthMeter(breach_index, bloom_filter, policy=policy)
+
+
+def _score_chunk(passwords: List[str]) -> List[Dict]:
+    return [_worker_meter.check_password_strength(password) for password in passwords]
+
+
+def _chunked(passwords: Iterable[str], size: int) -> Iterator[List[str]]:
+    chunk = []
+    for password in passwords:
+        chunk.append(password)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _shared_breach_index(breach_index: Union[str, Path, None]
+                         ) -> Tuple[Optional[str], Optional[tempfile.TemporaryDirectory]]:
+    """The breach index worker processes should map, plus any temporary directory holding it
+
+    An explicit index is used as is. Otherwise the prebuilt
+    common_passwords.idx is preferred; failing that, common_passwords.txt is
+    converted into a temporary index once, in the calling process, and the
+    caller cleans up the returned directory when its workers are done.
+    """
+    if breach_index is not None:
+        return str(breach_index), None
+    if COMMON_PASSWORDS_INDEX.exists():
+        return str(COMMON_PASSWORDS_INDEX), None
+    if not COMMON_PASSWORDS_FILE.exists():
+        return None, None
+    tmp_dir = tempfile.TemporaryDirectory(prefix="password-index-")
+    index_path = Path(tmp_dir.name) / "common_passwords.idx"
+    try:
+        with open(COMMON_PASSWORDS_FILE, "r", encoding="utf-8", errors="replace") as f:
+            BreachIndex.build(f, index_path)
+    except BaseException:
+        tmp_dir.cleanup()
+        raise
+    return str(index_path), tmp_dir
+
+
+class ParallelScorer:
+    """Scores password streams across a process pool, returning results in order
+
+    Workers never build their own copy of the word list. A breach index is
+    memory-mapped by every worker, so they all read the same pages from the
+    OS page cache; when only common_passwords.txt exists, it is converted
+    into a temporary index once in the parent process before the pool starts.
+    Input is sent in chunks with a bounded number in flight, so memory stays
+    flat for arbitrarily long streams.
+    """
+
+    def __init__(self, workers: int = None, chunk_size: int = 1000,
+                 breach_index: Union[str, Path, None] = None,
+                 bloom_filter: Union[str, Path, None] = None,
+                 max_in_flight: int = 4,
+                 policy: Union[str, Path, ScoringPolicy, None] = None):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.max_in_flight = max_in_flight
+        self.bloom_filter = str(bloom_filter) if bloom_filter else None
+        self._tmp_dir = None
+        self._pool = None
+
+        # Load a policy file once here rather than in every worker
+        if policy is not None and not isinstance(policy, ScoringPolicy):
+            policy = ScoringPolicy.from_file(policy)
+        self.policy = policy
+
+        if self.workers > 1:
+            self.breach_index, self._tmp_dir = _shared_breach_index(breach_index)
+        else:
+            self.breach_index = str(breach_index) if breach_index else None
+
+    def __enter__(self) -> "ParallelScorer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+        if self._tmp_dir is not None:
+            self._tmp_dir.cleanup()
+            self._tmp_dir = None
+
+    def score(self, passwords: Iterable[str]) -> Iterator[Dict]:
+        """Yield check_password_strength results in input order"""
+        chunks = _chunked(passwords, self.chunk_size)
+
+        if self.workers <= 1:
+            meter = get_meter(self.breach_index, self.bloom_filter, policy=self.policy)
+            for chunk in chunks:
+                for password in chunk:
+                    yield meter.check_password_strength(password)
+            return
+
+        if self._pool is None:
+            self._pool = Pool(self.workers, _init_worker, (self.breach_index, self.bloom_filter, self.policy))
+
+        pending = deque()
+        limit = self.workers * self.max_in_flight
+        for chunk in chunks:
+            pending.append(self._pool.apply_async(_score_chunk, (chunk,)))
+            if len(pending) >= limit:
+                yield from pending.popleft().get()
+        while pending:
+            yield from pending.popleft().get()
+
+
+def benchmark(total: int = 200_000, worker_counts: Iterable[int] = (1, 2, 4, 8),
+              chunk_size: int = 1000, seed: int = 0) -> List[Dict[str, float]]:
+    """Time ParallelScorer on synthetic passwords at each worker count"""
+    rng = random.Random(seed)
+    alphabet = string.ascii_letters + string.digits + "!@#$%^&*"
+    passwords = ["".join(rng.choice(alphabet) for _ in range(rng.randint(6, 20))) for _ in range(total)]
+
+    results = []
+    baseline = None
+    for workers in worker_counts:
+        with ParallelScorer(workers, chunk_size) as scorer:
+            # Warm the pool up so process start-up is not counted
+            for _ in scorer.score(passwords[:workers * chunk_size]):
+                pass
+            start = time.perf_counter()
+            for _ in scorer.score(passwords):
+                pass
+            elapsed = time.perf_counter() - start
+        rate = total / elapsed
+        baseline = baseline or rate
+        results.append({
+            "workers": workers,
+            "seconds": round(elapsed, 3),
+            "passwords_per_sec": round(rate),
+            "speedup": round(rate / baseline, 2)
+        })
+    return results
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark parallel password scoring at several worker counts")
+    parser.add_argument("--passwords", type=int, default=200_000, help="Synthetic passwords to score (default: 200000)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8],
+                        help="Worker counts to compare (default: 1 2 4 8)")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    results = benchmark(args.passwords, args.workers, args.chunk_size)
+    if args.json:
+        print(json.dumps({"cpu_count": os.cpu_count(), "results": results}, indent=2))
+    else:
+        print(f"CPUs: {os.cpu_count()}")
+        print(f"{'workers':>8} {'seconds':>9} {'passwords/s':>12} {'speedup':>8}")
+        for row in results:
+            print(f"{row['workers']:>8} {row['seconds']:>9.3f} {row['passwords_per_sec']:>12,} {row['speedup']:>7.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+import argparse
+import math
+import mmap
+import os
+import secrets
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Iterator, List, Tuple, Union
+
+# Default word list for the Streamlit app, one word per line (diceware
+# lists with a dice-roll column such as "11111<TAB>abacus" work as well)
+DEFAULT_WORD_LIST = Path(__file__).parent / "wordlist.txt"
+
+# Header: magic, number of words, size of the word buffer in bytes
+_HEADER = struct.Struct("<8sQQ")
+_MAGIC = b"PWWORDS\x01"
+_OFFSET = struct.Struct("<Q")
+
+
+class WordList:
+    """Memory-mapped word list: one contiguous UTF-8 buffer plus an offsets array
+
+    The first time a text word list is opened, its words are deduplicated
+    and written to a compact index file next to it (<list>.idx). Later runs
+    map that file directly, so even a 100k-word dictionary is ready without
+    parsing or building a Python list of strings. Where the index cannot be
+    written (a read-only deployment), it is built into anonymous memory
+    instead, once per open.
+    """
+
+    def __init__(self, path: Union[str, Path], data: bytes = None):
+        self.path = Path(path)
+        if data is None:
+            with open(self.path, "rb") as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self._map = mmap.mmap(-1, len(data))
+            self._map.write(data)
+
+        magic, self.count, blob_size = _HEADER.unpack_from(self._map, 0)
+        if magic != _MAGIC:
+            self._map.close()
+            raise ValueError(f"{self.path} is not a word list index")
+        self._blob_start = _HEADER.size + (self.count + 1) * _OFFSET.size
+        if len(self._map) != self._blob_start + blob_size:
+            self._map.close()
+            raise ValueError(f"{self.path} is truncated or corrupt")
+        self._offsets = memoryview(self._map)[_HEADER.size:self._blob_start].cast("Q")
+        if sys.byteorder != "little":
+            # Offsets are stored little-endian; swap a copy on big-endian hosts
+            offsets = array("Q", self._offsets)
+            self._offsets.release()
+            offsets.byteswap()
+            self._offsets = offsets
+
+    @classmethod
+    def open(cls, path: Union[str, Path]) -> "WordList":
+        """Open a word list, building or refreshing its index file when needed"""
+        path = Path(path)
+        if path.suffix == ".idx":
+            return cls(path)
+        index_path = path.with_name(path.name + ".idx")
+        if index_path.exists() and index_path.stat().st_mtime >= path.stat().st_mtime:
+            return cls(index_path)
+        data = cls._encode(path)
+        try:
+            cls._write(data, index_path)
+        except OSError:
+            # Read-only directory: keep the index in memory for this process
+            return cls(path, data)
+        return cls(index_path)
+
+    @classmethod
+    def build(cls, source: Union[str, Path], output: Union[str, Path]) -> int:
+        """Write the index file for a text word list and return the word count"""
+        data = cls._encode(source)
+        cls._write(data, output)
+        return _HEADER.unpack_from(data, 0)[1]
+
+    @staticmethod
+    def _write(data: bytes, output: Union[str, Path]) -> None:
+        tmp_output = Path(str(output) + ".tmp")
+        try:
+            with open(tmp_output, "wb") as out:
+                out.write(data)
+            os.replace(tmp_output, output)
+        except OSError:
+            tmp_output.unlink(missing_ok=True)
+            raise
+
+    @staticmethod
+    def _encode(source: Union[str, Path]) -> bytes:
+        """The index file contents for a text word list"""
+        seen = set()
+        words: List[bytes] = []
+        with open(source, "r", encoding="utf-8") as f:
+            for line in f:
+                parts = line.split()
+                if not parts:
+                    continue
+                word = parts[-1].encode("utf-8")
+                if word not in seen:
+                    seen.add(word)
+                    words.append(word)
+        if not words:
+            raise ValueError(f"{source} contains no words")
+
+        offsets = array("Q", [0])
+        for word in words:
+            offsets.append(offsets[-1] + len(word))
+        blob_size = offsets[-1]
+        if sys.byteorder != "little":
+            offsets.byteswap()
+        return b"".join([_HEADER.pack(_MAGIC, len(words), blob_size), offsets.tobytes(), *words])
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> str:
+        if not 0 <= index < self.count:
+            raise IndexError("word index out of range")
+        start = self._blob_start + self._offsets[index]
+        end = self._blob_start + self._offsets[index + 1]
+        return self._map[start:end].decode("utf-8")
+
+    def entropy_bits(self, num_words: int) -> float:
+        """Exact entropy of a phrase of num_words independently chosen words"""
+        return num_words * math.log2(self.count)
+
+    def close(self) -> None:
+        if isinstance(self._offsets, memoryview):
+            self._offsets.release()
+        self._map.close()
+
+
+class PassphraseGenerator:
+    """Diceware-style passphrases drawn with the secrets CSPRNG"""
+
+    def __init__(self, word_list: Union[str, Path, WordList] = DEFAULT_WORD_LIST):
+        self.words = word_list if isinstance(word_list, WordList) else WordList.open(word_list)
+
+    def entropy_bits(self, num_words: int = 6, include_number: bool = False) -> float:
+        """Exact entropy of one phrase; separators and capitalization add none"""
+        bits = self.words.entropy_bits(num_words)
+        if include_number:
+            bits += math.log2(10)
+        return bits
+
+    def generate(self, num_words: int = 6, separator: str = "-", capitalize: bool = False,
+                 include_number: bool = False) -> Tuple[str, float]:
+        """Return a passphrase and its entropy in bits"""
+        return next(self.generate_many(1, num_words, separator, capitalize, include_number))
+
+    def generate_many(self, count: int, num_words: int = 6, separator: str = "-",
+                      capitalize: bool = False, include_number: bool = False) -> Iterator[Tuple[str, float]]:
+        """Yield count passphrases with their entropy in bits"""
+        if num_words < 1:
+            raise ValueError("A passphrase needs at least one word")
+        words = self.words
+        size = len(words)
+        bits = self.entropy_bits(num_words, include_number)
+        for _ in range(count):
+            phrase = [words[secrets.randbelow(size)] for _ in range(num_words)]
+            if capitalize:
+                phrase = [word.capitalize() for word in phrase]
+            if include_number:
+                phrase.append(str(secrets.randbelow(10)))
+            yield separator.join(phrase), bits
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate diceware-style passphrases from a word list")
+    parser.add_argument("word_list", nargs="?", default=str(DEFAULT_WORD_LIST),
+                        help="Word list, one word per line (default: wordlist.txt)")
+    parser.add_argument("-n", "--count", type=int, default=1, help="Number of passphrases (default: 1)")
+    parser.add_argument("-w", "--words", type=int, default=6, help="Words per passphrase (default: 6)")
+    parser.add_argument("-s", "--separator", default="-", help="Word separator (default: -)")
+    parser.add_argument("--capitalize", action="store_true", help="Capitalize each word")
+    parser.add_argument("--number", action="store_true", help="Append a random digit")
+    args = parser.parse_args(argv)
+
+    generator = PassphraseGenerator(args.word_list)
+    print(f"{len(generator.words):,} words, "
+          f"{generator.entropy_bits(args.words, args.number):.1f} bits per passphrase", file=sys.stderr)
+    for phrase, _ in generator.generate_many(args.count, args.words, args.separator, args.capitalize, args.number):
+        print(phrase)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,103 +1,292 @@
 import re
-import random
+import secrets
 import string
 import math
-from typing import Dict, List, Union
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Union
 import json
 from pathlib import Path
+from bloom_filter import BloomFilter
+from breach_index import BreachIndex
+from range_store import RangeStore
+from score_cache import ScoreCache
+from scoring_policy import DIGITS, LOWERCASE, SPECIAL, UPPERCASE, ScoringPolicy
+
+# Optional word list and its prebuilt index/filter, picked up from the app directory
+COMMON_PASSWORDS_FILE = Path(__file__).parent / "common_passwords.txt"
+COMMON_PASSWORDS_INDEX = Path(__file__).parent / "common_passwords.idx"
+COMMON_PASSWORDS_FILTER = Path(__file__).parent / "common_passwords.bloom"
+COMMON_PASSWORDS_RANGE = Path(__file__).parent / "common_passwords.range"
+
+# Rejected in generated passwords: triple repeats and obvious substrings
+_WEAK_GENERATED = re.compile(r'(.)\1\1|(?i:pass|word|1234|abcd)')
+_WEAK_GENERATED_SUBSTRINGS = frozenset({"pass", "word", "1234", "abcd"})
+
+# Most common passwords, always checked regardless of any word list or filter
+COMMON_PASSWORDS = frozenset({
+    "password", "123456", "qwerty", "admin", "letmein",
+    "welcome", "password123", "admin123", "12345678", "abc123",
+    "monkey", "dragon", "baseball", "football", "letme1n",
+    "master", "hello123", "shadow", "superman", "qwerty123",
+    "welcome123", "ninja", "abc123456", "123456789", "password1"
+})
 
 class PasswordStrengthMeter:
-    def __init__(self):
-        # Load common passwords from file
-        self.common_passwords = self._load_common_passwords()
-
-        # Enhanced scoring weights with more granular controls
-        self.weights = {
-            "length": 1.5,      # Increased weight for length
-            "uppercase": 1.0,   # Basic requirement
-            "lowercase": 1.0,   # Basic requirement
-            "digits": 1.0,      # Basic requirement
-            "special": 1.2,     # Bonus for special characters
-            "complexity": 1.3,  # Bonus for complexity
-            "entropy": 1.2      # Bonus for randomness
-        }
-
-        # Extended complexity patterns
-        self.complexity_patterns = [
-            # Penalize patterns
-            (r'(.)\1\1+', -0.5),  # Repeated characters
-            (r'(abc|bcd|cde|def|efg|fgh|ghi|hij|ijk|jkl|klm|lmn|mno|nop|opq|pqr|qrs|rst|stu|tuv|uvw|vwx|wxy|xyz)', -0.3),  # Sequential letters
-            (r'(123|234|345|456|567|678|789|890)', -0.3),  # Sequential numbers
-            (r'(qwerty|asdfgh|zxcvbn)', -0.4),  # Keyboard patterns
-
-            # Bonus patterns
-            (r'(?=.*[A-Z].*[A-Z])', 0.2),  # Multiple uppercase
-            (r'(?=.*[!@#$%^&*].*[!@#$%^&*])', 0.2),  # Multiple special chars
-            (r'(?=.*\d.*\d.*\d)', 0.2),  # Multiple numbers
-            (r'(?=.*[a-z].*[A-Z].*\d.*[!@#$%^&*])', 0.3)  # Good mix of characters
-        ]
-
-        # Special character set
-        self.special_chars = "!@#$%^&*"
-
-        # Minimum requirements
-        self.min_length = 8
-        self.recommended_length = 12
-
-    def _load_common_passwords(self) -> set:
+    def __init__(self, breach_index: Union[str, Path, BreachIndex, None] = None,
+                 bloom_filter: Union[str, Path, BloomFilter, None] = None,
+                 cache_size: int = 0,
+                 policy: Union[str, Path, ScoringPolicy, None] = None,
+                 range_store: Union[str, Path, RangeStore, None] = None):
+        # Opt-in LRU cache of scoring results (disabled when cache_size is 0)
+        self.score_cache = ScoreCache(cache_size) if cache_size else None
+
+        # Memory-mapped breach index, used instead of reading common_passwords.txt
+        if breach_index is None:
+            if COMMON_PASSWORDS_INDEX.exists():
+                breach_index = COMMON_PASSWORDS_INDEX
+        if breach_index is not None and not isinstance(breach_index, BreachIndex):
+            breach_index = BreachIndex(breach_index)
+        self.breach_index = breach_index
+
+        # Optional Bloom filter answering "definitely not common" before the exact stores
+        if bloom_filter is None:
+            if COMMON_PASSWORDS_FILTER.exists():
+                bloom_filter = COMMON_PASSWORDS_FILTER
+        if bloom_filter is not None and not isinstance(bloom_filter, BloomFilter):
+            bloom_filter = BloomFilter.load(bloom_filter)
+        self.bloom_filter = bloom_filter
+
+        # Hash-prefix bucketed breach corpus (exact passwords, Pwned Passwords style)
+        if range_store is None:
+            if COMMON_PASSWORDS_RANGE.exists():
+                range_store = COMMON_PASSWORDS_RANGE
+        if range_store is not None and not isinstance(range_store, RangeStore):
+            range_store = RangeStore(range_store)
+        self.range_store = range_store
+
+        # Common passwords are loaded on first lookup (see common_passwords)
+        self._common_passwords = None
+        self._load_lock = threading.Lock()
+
+        # Scoring rules: weights, penalties, patterns, thresholds. A policy
+        # file is compiled once here, so scoring itself never re-parses it
+        if policy is None:
+            policy = ScoringPolicy()
+        elif not isinstance(policy, ScoringPolicy):
+            policy = ScoringPolicy.from_file(policy)
+        self.policy = policy
+
+        self.weights = dict(policy.weights)
+        self.penalties = dict(policy.penalties)
+        self.complexity_bonuses = dict(policy.complexity_bonuses)
+        self.special_chars = policy.special_chars
+        self.min_length = policy.min_length
+        self.recommended_length = policy.recommended_length
+        self.long_length = policy.long_length
+        self.max_score = policy.max_score
+
+        # Literal patterns behind the penalties, compiled into one automaton
+        # so any number of patterns is matched in a single pass
+        self.pattern_matcher = policy.build_matcher()
+
+    @property
+    def common_passwords(self) -> set:
+        """Built-in list plus common_passwords.txt, read once on first use"""
+        if self._common_passwords is None:
+            with self._load_lock:
+                if self._common_passwords is None:
+                    self._common_passwords = self._load_common_passwords(load_file=self.breach_index is None)
+        return self._common_passwords
+
+    def _load_common_passwords(self, load_file: bool = True) -> set:
         """Load common passwords from a predefined set and optional file"""
-        common_passwords = {
-            "password", "123456", "qwerty", "admin", "letmein",
-            "welcome", "password123", "admin123", "12345678", "abc123",
-            "monkey", "dragon", "baseball", "football", "letme1n",
-            "master", "hello123", "shadow", "superman", "qwerty123",
-            "welcome123", "ninja", "abc123456", "123456789", "password1"
-        }
+        common_passwords = set(COMMON_PASSWORDS)
+
+        if not load_file:
+            return common_passwords
 
         # Try to load additional passwords from file if exists
         try:
-            password_file = Path(__file__).parent / "common_passwords.txt"
-            if password_file.exists():
-                with open(password_file, 'r') as f:
+            if COMMON_PASSWORDS_FILE.exists():
+                with open(COMMON_PASSWORDS_FILE, 'r') as f:
                     common_passwords.update(line.strip().lower() for line in f)
         except Exception:
             pass  # Fail silently if file operations fail
 
         return common_passwords
 
-    def calculate_entropy(self, password: str) -> float:
+    def is_common_password(self, password: str) -> bool:
+        """Check the built-in list, then the word list, breach index and range store
+
+        With a Bloom filter configured, passwords the filter rules out never
+        reach the word list or the index. The range store holds a separate
+        corpus, so it is checked either way.
+        """
+        lowered = password.lower()
+        if lowered in COMMON_PASSWORDS:
+            return True
+        if self.bloom_filter is None or lowered in self.bloom_filter:
+            if lowered in self.common_passwords:
+                return True
+            if self.breach_index is not None and lowered in self.breach_index:
+                return True
+        return self.range_store is not None and password in self.range_store
+
+    def add_pattern_group(self, name: str, patterns: Iterable[str], weight: float) -> None:
+        """Penalize (or reward) a group of literal patterns such as keyboard walks"""
+        self.penalties[name] = weight
+        self.pattern_matcher.add(name, patterns)
+        self.pattern_matcher.compile()
+        if self.score_cache is not None:
+            self.score_cache.clear()
+
+    def _analyze(self, password: str) -> Dict[str, Union[int, dict, set]]:
+        """Walk the password once and build the profile shared by scoring and entropy
+
+        The profile holds per-class character counts, a character frequency
+        histogram, the longest run of a repeated character and the names of
+        the penalty patterns and complexity bonuses that apply.
+        """
+        counts = [0, 0, 0, 0]  # Indexed like CHARACTER_CLASSES
+        frequencies = {}
+        max_run = run = 0
+        mix = 0  # Progress through lowercase -> uppercase -> number -> special
+        bonuses = set()
+        pattern_hits = set()
+        char_classes = self.policy.char_classes
+        step = self.pattern_matcher.step
+        output = self.pattern_matcher.output
+        state = 0
+        prev = ""
+
+        # Bonuses only count characters within one line, like the regex
+        # lookaheads they replace, so track the counts where each line starts
+        line_counts = (0, 0, 0, 0)
+
+        def close_line():
+            if counts[UPPERCASE] - line_counts[UPPERCASE] >= 2:
+                bonuses.add("multiple_uppercase")
+            if counts[SPECIAL] - line_counts[SPECIAL] >= 2:
+                bonuses.add("multiple_special")
+            if counts[DIGITS] - line_counts[DIGITS] >= 3:
+                bonuses.add("multiple_digits")
+            if mix == 4:
+                bonuses.add("character_mix")
+
+        for char in password:
+            frequencies[char] = frequencies.get(char, 0) + 1
+
+            char_class = char_classes.get(char)
+            if char_class is None:
+                if char.isdecimal():  # Non-ASCII digits, same set as the \d regex class
+                    char_class = DIGITS
+                elif char == '\n':
+                    close_line()
+                    line_counts = tuple(counts)
+                    mix = 0
+            if char_class is not None:
+                counts[char_class] += 1
+                if char_class == mix:
+                    mix += 1
+
+            # Newlines never count as repeats, matching the old (.)\1\1+ check
+            if char == prev and char != '\n':
+                run += 1
+            else:
+                run = 1
+            if run > max_run:
+                max_run = run
+            prev = char
+
+            state = step(state, char)
+            if output[state]:
+                pattern_hits |= output[state]
+
+        close_line()
+
+        patterns = {self.pattern_matcher.groups[group_id] for group_id in pattern_hits}
+        if max_run >= 3:
+            patterns.add("repeated")
+
+        return {
+            "classes": {
+                "uppercase": counts[UPPERCASE],
+                "lowercase": counts[LOWERCASE],
+                "digits": counts[DIGITS],
+                "special": counts[SPECIAL]
+            },
+            "frequencies": frequencies,
+            "max_run": max_run,
+            "patterns": patterns,
+            "bonuses": bonuses
+        }
+
+    def _histogram(self, password: str) -> Dict[str, Union[int, dict, set]]:
+        """Just the part of the profile entropy needs: class counts and character frequencies
+
+        Classes are looked up once per distinct character rather than per
+        character, and no patterns, runs or bonuses are computed.
+        """
+        frequencies = Counter(password)
+        counts = [0, 0, 0, 0]  # Indexed like CHARACTER_CLASSES
+        char_classes = self.policy.char_classes
+        for char, count in frequencies.items():
+            char_class = char_classes.get(char)
+            if char_class is None and char.isdecimal():  # Same fallback as _analyze
+                char_class = DIGITS
+            if char_class is not None:
+                counts[char_class] += count
+        return {
+            "classes": {
+                "uppercase": counts[UPPERCASE],
+                "lowercase": counts[LOWERCASE],
+                "digits": counts[DIGITS],
+                "special": counts[SPECIAL]
+            },
+            "frequencies": frequencies
+        }
+
+    def calculate_entropy(self, password: str, profile: Dict[str, Union[int, dict, set]] = None) -> float:
         """Calculate password entropy (randomness) with improved accuracy"""
         if not password:
             return 0.0
 
-        # Calculate character set size
-        has_lower = bool(re.search(r'[a-z]', password))
-        has_upper = bool(re.search(r'[A-Z]', password))
-        has_digit = bool(re.search(r'\d', password))
-        has_special = bool(re.search(f'[{re.escape(self.special_chars)}]', password))
+        if profile is None:
+            profile = self._histogram(password)
+        class_counts = profile["classes"]
 
+        # Calculate character set size
         charset_size = 0
-        if has_lower: charset_size += 26
-        if has_upper: charset_size += 26
-        if has_digit: charset_size += 10
-        if has_special: charset_size += len(self.special_chars)
+        if class_counts["lowercase"]: charset_size += 26
+        if class_counts["uppercase"]: charset_size += 26
+        if class_counts["digits"]: charset_size += 10
+        if class_counts["special"]: charset_size += len(self.special_chars)
 
         # Calculate basic entropy
         length = len(password)
         basic_entropy = length * math.log2(max(charset_size, 1))
 
         # Adjust for repetition patterns
-        char_freq = {}
-        for char in password:
-            char_freq[char] = char_freq.get(char, 0) + 1
-
-        repetition_penalty = sum(count * math.log2(count) for count in char_freq.values() if count > 1)
+        repetition_penalty = sum(
+            count * math.log2(count) for count in profile["frequencies"].values() if count > 1
+        )
         adjusted_entropy = max(0, basic_entropy - repetition_penalty/2)
 
         return adjusted_entropy
 
     def check_password_strength(self, password: str) -> Dict[str, Union[int, str, List[str], dict, float]]:
         """Enhanced password strength evaluation with detailed analysis"""
+        if self.score_cache is None:
+            return self._score_password(password)
+        return self.score_cache.get_or_compute(password, self._score_password)
+
+    def _score_password(self, password: str) -> Dict[str, Union[int, str, List[str], dict, float]]:
+        """Score a password from scratch (check_password_strength adds caching)"""
+        return self._score_profile(password, self._analyze(password))
+
+    def _score_profile(self, password: str, profile: Dict[str, Union[int, dict, set]]) -> Dict[str, Union[int, str, List[str], dict, float]]:
+        """Turn a password and its profile into the scoring result"""
         if not password:
             return {
                 "score": 0,
@@ -109,7 +298,7 @@ class PasswordStrengthMeter:
             }
 
         # Check against common passwords
-        if password.lower() in self.common_passwords:
+        if self.is_common_password(password):
             return {
                 "score": 1,
                 "strength": "Very Weak",
@@ -118,7 +307,7 @@ class PasswordStrengthMeter:
                     "Common passwords are the first ones attackers try."
                 ],
                 "details": {},
-                "entropy": self.calculate_entropy(password),
+                "entropy": self.calculate_entropy(password, profile),
                 "length": len(password)
             }
 
@@ -137,19 +326,20 @@ class PasswordStrengthMeter:
             feedback.append(f"Password should be at least {self.min_length} characters long")
         elif length < self.recommended_length:
             feedback.append(f"Consider using at least {self.recommended_length} characters for stronger security")
-        elif length >= 16:
+        elif length >= self.long_length:
             feedback.append("Good length! Longer passwords are harder to crack")
 
         # Character type analysis
-        patterns = {
-            "uppercase": (r'[A-Z]', "uppercase letter", "Uppercase letters (A-Z)"),
-            "lowercase": (r'[a-z]', "lowercase letter", "Lowercase letters (a-z)"),
-            "digits": (r'\d', "number", "Numbers (0-9)"),
-            "special": (f'[{re.escape(self.special_chars)}]', "special character", f"Special characters ({self.special_chars})")
+        class_counts = profile["classes"]
+        descriptions = {
+            "uppercase": "uppercase letter",
+            "lowercase": "lowercase letter",
+            "digits": "number",
+            "special": "special character"
         }
 
-        for key, (pattern, desc, full_desc) in patterns.items():
-            matches = len(re.findall(pattern, password))
+        for key, desc in descriptions.items():
+            matches = class_counts[key]
             details[key] = matches > 0
             if details[key]:
                 score += self.weights[key]
@@ -160,28 +350,24 @@ class PasswordStrengthMeter:
 
         # Complexity analysis
         complexity_score = 0
-        for pattern, weight in self.complexity_patterns:
-            if re.search(pattern, password):
+        for name, weight in self.penalties.items():
+            if name in profile["patterns"]:
+                complexity_score += weight
+        for name, weight in self.complexity_bonuses.items():
+            if name in profile["bonuses"]:
                 complexity_score += weight
 
         score += complexity_score * self.weights["complexity"]
 
         # Entropy analysis
-        entropy = self.calculate_entropy(password)
+        entropy = self.calculate_entropy(password, profile)
         entropy_bonus = min(1, entropy / 4.0)
         score += entropy_bonus * self.weights["entropy"]
 
-        # Determine strength level with more granular categories
-        if score <= 2:
-            strength = "Very Weak"
-        elif score <= 3:
-            strength = "Weak"
-        elif score <= 4:
-            strength = "Moderate"
-        elif score <= 5:
-            strength = "Strong"
-        else:
-            strength = "Very Strong"
+        # Determine strength level from the policy's threshold array
+        strength = self.policy.strength(score)
+        bounds = self.policy.strength_bounds
+        if not bounds or score > bounds[-1]:  # Top level: above every threshold
             if not feedback:
                 feedback = ["Excellent! Your password meets all security criteria."]
 
@@ -189,11 +375,11 @@ class PasswordStrengthMeter:
         if score > 4:
             if entropy > 3.5:
                 feedback.append("Good job! Your password has high complexity and randomness.")
-            if length >= 16:
+            if length >= self.long_length:
                 feedback.append("Excellent length! This makes the password much harder to crack.")
 
         return {
-            "score": min(6, score),  # Cap score at 6
+            "score": min(self.max_score, score),  # Cap score at the policy maximum
             "strength": strength,
             "feedback": feedback,
             "details": details,
@@ -201,47 +387,116 @@ class PasswordStrengthMeter:
             "length": length
         }
 
+    def check_many(self, passwords: Iterable[str]) -> Dict[str, Union[list, Dict[str, list]]]:
+        """Score a batch of passwords and return the results as columns
+
+        Accepts any iterable of strings (lists, NumPy arrays, pandas Series).
+        Each row matches check_password_strength exactly; missing values are
+        scored as an empty password. The result mirrors the single-call dict
+        with every value turned into a list, and the per-criterion flags are
+        kept as columns under "details" (None where a row has no analysis).
+        """
+        columns = {
+            "score": [],
+            "strength": [],
+            "feedback": [],
+            "entropy": [],
+            "length": []
+        }
+        details = {key: [] for key in ("length", "uppercase", "lowercase", "digits", "special")}
+
+        for password in passwords:
+            if not isinstance(password, str):
+                password = ""
+            result = self.check_password_strength(password)
+            for key, column in columns.items():
+                column.append(result[key])
+            for key, column in details.items():
+                column.append(result["details"].get(key))
+
+        columns["details"] = details
+        return columns
+
     def generate_password(self, length: int = 16, include_special: bool = True) -> str:
         """Enhanced password generator with improved randomness and pattern avoidance"""
+        return self.generate_many(1, length, include_special)[0]
+
+    def generate_many(self, n: int, length: int = 16, include_special: bool = True) -> List[str]:
+        """Generate n passwords from the operating system's CSPRNG
+
+        Random bytes are drawn in large buffers and mapped onto the alphabet
+        with rejection sampling (bytes past the last multiple of the alphabet
+        size are dropped), so every character is uniform and unbiased. A
+        character that would complete a triple repeat or one of the weak
+        substrings 'pass', 'word', '1234' or 'abcd' is redrawn on its own,
+        so the cost stays linear in the length. A finished password missing
+        a required character type is redrawn whole; that gets rarer, not
+        more common, as passwords get longer.
+        """
         if length < self.min_length:
             length = max(16, self.min_length)  # Use 16 or min_length, whichever is larger
 
-        # Character sets
-        lowercase = string.ascii_lowercase
-        uppercase = string.ascii_uppercase
-        digits = string.digits
-        special = self.special_chars if include_special else ""
-
-        # Ensure minimum requirements
-        password = [
-            random.choice(lowercase),
-            random.choice(uppercase),
-            random.choice(digits)
-        ]
-
-        if include_special:
-            password.append(random.choice(special))
-
-        # Fill remaining length with random characters
-        all_chars = lowercase + uppercase + digits + (special if include_special else "")
-        remaining_length = length - len(password)
-
-        # Add remaining characters while avoiding patterns
-        for _ in range(remaining_length):
-            new_char = random.choice(all_chars)
-            # Avoid three consecutive same characters and simple patterns
-            while (len(password) >= 2 and
-                   (new_char == password[-1] == password[-2] or
-                    (len(password) >= 3 and
-                     ''.join(password[-3:] + [new_char]).lower() in ['pass', 'word', '1234', 'abcd']))):
-                new_char = random.choice(all_chars)
-            password.append(new_char)
-
-        # Shuffle the password multiple times for better randomness
-        for _ in range(3):
-            random.shuffle(password)
-
-        return ''.join(password)
+        # Character sets, each of which must appear at least once
+        required = [string.ascii_lowercase, string.ascii_uppercase, string.digits]
+        if include_special and self.special_chars:  # A policy may define no special characters
+            required.append(self.special_chars)
+        alphabet = "".join(required)
+        if len(alphabet) > 256:
+            raise ValueError("Alphabet is too large for byte-wise sampling")
+        required_sets = [frozenset(chars) for chars in required]
+
+        # Accept only bytes below the largest multiple of the alphabet size
+        limit = 256 - 256 % len(alphabet)
+        if alphabet.isascii():
+            table = bytes(ord(alphabet[b % len(alphabet)]) if b < limit else 0 for b in range(256))
+            rejected = bytes(range(limit, 256))
+
+            def draw(count: int) -> str:
+                return secrets.token_bytes(count).translate(table, rejected).decode("ascii")
+        else:
+            def draw(count: int) -> str:
+                return "".join(alphabet[b % len(alphabet)] for b in secrets.token_bytes(count) if b < limit)
+
+        passwords: List[str] = []
+        pool = ""
+        position = 0
+        while len(passwords) < n:
+            if len(pool) - position < length:
+                # Enough bytes for the remaining passwords plus rejection headroom
+                wanted = (n - len(passwords)) * length * 2 * 256 // limit
+                pool = pool[position:] + draw(min(max(wanted, 256), 1 << 20))
+                position = 0
+                continue
+            candidate = pool[position:position + length]
+            if _WEAK_GENERATED.search(candidate):
+                candidate, pool, position = self._repair_candidate(pool, position, length, draw)
+            else:
+                position += length
+            if all(not chars.isdisjoint(candidate) for chars in required_sets):
+                passwords.append(candidate)
+
+        return passwords
+
+    @staticmethod
+    def _repair_candidate(pool: str, position: int, length: int, draw) -> tuple:
+        """Take length characters from the pool, skipping any that completes a weak pattern
+
+        With nothing to skip this consumes exactly pool[position:position + length],
+        so repaired and clean candidates are drawn the same way.
+        """
+        chars: List[str] = []
+        while len(chars) < length:
+            if position == len(pool):
+                pool, position = draw(4096), 0
+                continue
+            char = pool[position]
+            position += 1
+            if len(chars) >= 2 and chars[-1] == char and chars[-2] == char:
+                continue
+            if len(chars) >= 3 and (chars[-3] + chars[-2] + chars[-1] + char).lower() in _WEAK_GENERATED_SUBSTRINGS:
+                continue
+            chars.append(char)
+        return "".join(chars), pool, position
 
     def get_strength_color(self, strength: str) -> str:
         """Get color code for password strength with improved visibility"""
@@ -253,3 +508,175 @@ class PasswordStrengthMeter:
             "Very Strong": "#198754"   # Darker green
         }
         return colors.get(strength, "#dc3545")  # Default to danger red
+
+
+
+class IncrementalAnalyzer:
+    """Keeps a password's profile up to date as characters are typed or deleted
+
+    Each appended character pushes a small snapshot of the running analysis
+    (repeat run, pattern automaton state, character-mix progress) and
+    updates the class counts and frequency histogram in place. Deleting the
+    last character pops the snapshot and undoes the counts, so the analysis
+    itself does constant work per edited character. Keeping the text and
+    scoring it are still linear in its length (the string is copied on each
+    edit, and result() lowercases and looks up the whole password in the
+    common-password stores), just with a small constant. Entropy is derived
+    from the histogram, which is bounded by the alphabet rather than the
+    length. Results match check_password_strength for the same text.
+    """
+
+    # Snapshot fields: character, its class, repeat run, longest run so far,
+    # character-mix progress, automaton state, pattern group ids hit so far,
+    # bonuses from finished lines, and class counts where the line started
+    _EMPTY = ("", None, 0, 0, 0, 0, frozenset(), frozenset(), 0, 0, 0)
+
+    def __init__(self, meter: PasswordStrengthMeter, text: str = ""):
+        self.meter = meter
+        self.text = ""
+        self._snapshots = []
+        self._counts = [0, 0, 0, 0]  # Indexed like CHARACTER_CLASSES
+        self._frequencies = {}
+        self.append(text)
+
+    def __len__(self) -> int:
+        return len(self.text)
+
+    def append(self, text: str) -> None:
+        """Add characters to the end of the password"""
+        for char in text:
+            self._push(char)
+        self.text += text
+
+    def delete(self, count: int = 1) -> None:
+        """Remove characters from the end of the password"""
+        count = min(count, len(self._snapshots))
+        for _ in range(count):
+            char, char_class = self._snapshots.pop()[:2]
+            if char_class is not None:
+                self._counts[char_class] -= 1
+            if self._frequencies[char] == 1:
+                del self._frequencies[char]
+            else:
+                self._frequencies[char] -= 1
+        if count:
+            self.text = self.text[:-count]
+
+    def set_text(self, text: str) -> None:
+        """Move to a new value, editing only the part after the common prefix
+
+        Suits inputs that report the whole field on every change, such as a
+        Streamlit text_input: typing or deleting at the end is one cheap edit.
+        """
+        current = self.text
+        if text.startswith(current):
+            self.append(text[len(current):])
+            return
+        common = 0
+        limit = min(len(current), len(text))
+        while common < limit and current[common] == text[common]:
+            common += 1
+        self.delete(len(current) - common)
+        self.append(text[common:])
+
+    def _push(self, char: str) -> None:
+        (prev, _, run, max_run, mix, state, hits, closed,
+         line_upper, line_digits, line_special) = self._snapshots[-1] if self._snapshots else self._EMPTY
+        counts = self._counts
+
+        char_class = self.meter.policy.char_classes.get(char)
+        if char_class is None:
+            if char.isdecimal():
+                char_class = DIGITS
+            elif char == '\n':
+                closed = closed | self._line_bonuses(line_upper, line_digits, line_special, mix)
+                line_upper, line_digits, line_special = counts[UPPERCASE], counts[DIGITS], counts[SPECIAL]
+                mix = 0
+        if char_class is not None:
+            counts[char_class] += 1
+            if char_class == mix:
+                mix += 1
+        self._frequencies[char] = self._frequencies.get(char, 0) + 1
+
+        run = run + 1 if char == prev and char != '\n' else 1
+        max_run = max(max_run, run)
+
+        matcher = self.meter.pattern_matcher
+        state = matcher.step(state, char)
+        output = matcher.output[state]
+        if output and not output <= hits:
+            hits = hits | output
+
+        self._snapshots.append((char, char_class, run, max_run, mix, state, hits, closed,
+                                line_upper, line_digits, line_special))
+
+    def _line_bonuses(self, line_upper: int, line_digits: int, line_special: int, mix: int) -> frozenset:
+        """Bonuses earned by the line that started at the given class counts"""
+        counts = self._counts
+        bonuses = []
+        if counts[UPPERCASE] - line_upper >= 2:
+            bonuses.append("multiple_uppercase")
+        if counts[SPECIAL] - line_special >= 2:
+            bonuses.append("multiple_special")
+        if counts[DIGITS] - line_digits >= 3:
+            bonuses.append("multiple_digits")
+        if mix == 4:
+            bonuses.append("character_mix")
+        return frozenset(bonuses)
+
+    def profile(self) -> Dict[str, Union[int, dict, set]]:
+        """The same profile PasswordStrengthMeter._analyze builds for the text"""
+        (_, _, _, max_run, mix, _, hits, closed,
+         line_upper, line_digits, line_special) = self._snapshots[-1] if self._snapshots else self._EMPTY
+
+        patterns = {self.meter.pattern_matcher.groups[group_id] for group_id in hits}
+        if max_run >= 3:
+            patterns.add("repeated")
+
+        return {
+            "classes": {
+                "uppercase": self._counts[UPPERCASE],
+                "lowercase": self._counts[LOWERCASE],
+                "digits": self._counts[DIGITS],
+                "special": self._counts[SPECIAL]
+            },
+            "frequencies": self._frequencies,
+            "max_run": max_run,
+            "patterns": patterns,
+            "bonuses": set(closed | self._line_bonuses(line_upper, line_digits, line_special, mix))
+        }
+
+    def result(self) -> Dict[str, Union[int, str, List[str], dict, float]]:
+        """Score the current text, as check_password_strength would (bypassing any score cache)"""
+        return self.meter._score_profile(self.text, self.profile())
+
+
+_shared_meters: Dict[tuple, PasswordStrengthMeter] = {}
+_shared_meters_lock = threading.Lock()
+
+
+def get_meter(breach_index: Union[str, Path, None] = None,
+              bloom_filter: Union[str, Path, None] = None,
+              cache_size: int = 0,
+              policy: Union[str, Path, ScoringPolicy, None] = None,
+              range_store: Union[str, Path, None] = None) -> PasswordStrengthMeter:
+    """Return the process-wide PasswordStrengthMeter for these settings
+
+    Building a meter compiles the pattern automaton and maps the index files,
+    and the first lookup reads the word list, so callers such as the
+    Streamlit app share one instance across reruns, sessions and threads.
+    Each scoring policy (a file path or a ScoringPolicy) gets its own meter,
+    so tenants with different policies never share compiled state.
+    """
+    if policy is not None and not isinstance(policy, ScoringPolicy):
+        policy = str(policy)
+    key = (str(breach_index) if breach_index else None, str(bloom_filter) if bloom_filter else None,
+           cache_size, policy, str(range_store) if range_store else None)
+    meter = _shared_meters.get(key)
+    if meter is None:
+        with _shared_meters_lock:
+            meter = _shared_meters.get(key)
+            if meter is None:
+                meter = PasswordStrengthMeter(breach_index, bloom_filter, cache_size, policy, range_store)
+                _shared_meters[key] = meter
+    return meter
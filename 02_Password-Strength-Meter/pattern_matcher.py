@@ -0,0 +1,101 @@
+from collections import deque
+from typing import Dict, FrozenSet, Iterable, List, Set
+
+
+class PatternMatcher:
+    """Aho-Corasick automaton that finds many literal patterns in one pass
+
+    Patterns are registered in named groups (for example "keyboard" or
+    "sequential_letters") and the matcher reports which groups occur in a
+    string. Matching costs one transition per character no matter how many
+    patterns are loaded, so thousands of keyboard walks or leet-speak
+    spellings can be added without slowing the scorer down.
+    """
+
+    def __init__(self, groups: Dict[str, Iterable[str]] = None):
+        self.groups: List[str] = []
+        self._patterns: Dict[str, Set[str]] = {}
+        self._compiled = False
+        for name, patterns in (groups or {}).items():
+            self.add(name, patterns)
+
+    def add(self, group: str, patterns: Iterable[str]) -> None:
+        """Add literal patterns to a group, creating the group if needed"""
+        if group not in self._patterns:
+            self.groups.append(group)
+            self._patterns[group] = set()
+        self._patterns[group].update(p for p in patterns if p)
+        self._compiled = False
+
+    def patterns(self, group: str) -> FrozenSet[str]:
+        """The literal patterns registered in a group"""
+        return frozenset(self._patterns.get(group, ()))
+
+    def compile(self) -> None:
+        """Build the trie, failure links and per-state outputs"""
+        goto: List[Dict[str, int]] = [{}]
+        output: List[Set[int]] = [set()]
+
+        for group_id, group in enumerate(self.groups):
+            for pattern in self._patterns[group]:
+                state = 0
+                for char in pattern:
+                    next_state = goto[state].get(char)
+                    if next_state is None:
+                        next_state = len(goto)
+                        goto[state][char] = next_state
+                        goto.append({})
+                        output.append(set())
+                    state = next_state
+                output[state].add(group_id)
+
+        # Breadth-first pass to set failure links and merge outputs
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in goto[state].items():
+                queue.append(next_state)
+                fallback = fail[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[next_state] = goto[fallback].get(char, 0)
+                output[next_state] |= output[fail[next_state]]
+
+        self._goto = goto
+        self._fail = fail
+        self.output: List[FrozenSet[int]] = [frozenset(hits) for hits in output]
+        # Resolved transitions, filled in lazily so repeated characters cost a
+        # single lookup. Only characters that occur in some pattern are
+        # memoized, so the table is bounded by states x pattern alphabet
+        self._alphabet = frozenset().union(*goto)
+        self._delta: List[Dict[str, int]] = [dict(edges) for edges in goto]
+        self._compiled = True
+
+    def step(self, state: int, char: str) -> int:
+        """Advance the automaton by one character
+
+        Group ids of the patterns ending at the new state are in output[state].
+        """
+        next_state = self._delta[state].get(char)
+        if next_state is None:
+            if char not in self._alphabet:
+                return 0  # No pattern contains it, so every match in progress ends here
+            fallback = state
+            while fallback and char not in self._goto[fallback]:
+                fallback = self._fail[fallback]
+            next_state = self._goto[fallback].get(char, 0)
+            self._delta[state][char] = next_state
+        return next_state
+
+    def find_groups(self, text: str) -> Set[str]:
+        """Names of all groups with at least one pattern in text"""
+        if not self._compiled:
+            self.compile()
+        hits: Set[int] = set()
+        state = 0
+        for char in text:
+            state = self.step(state, char)
+            if self.output[state]:
+                hits |= self.output[state]
+        return {self.groups[group_id] for group_id in hits}
@@ -0,0 +1,233 @@
+import argparse
+import hashlib
+import heapq
+import os
+import re
+import struct
+import sys
+import tempfile
+from array import array
+from pathlib import Path
+from typing import Iterable, List, Tuple, Union
+
+from breach_index import _read_records, _write_run
+
+# Header: magic, number of records; followed by one record offset per bucket
+# (plus an end offset), then the records themselves, sorted by digest
+_HEADER = struct.Struct("<8sQ")
+_MAGIC = b"PWRANGE\x01"
+_OFFSET = struct.Struct("<Q")
+
+# Buckets are keyed by the first 5 hex characters (20 bits) of the SHA-1
+PREFIX_LENGTH = 5
+_BUCKETS = 16 ** PREFIX_LENGTH
+
+# Record: the digest after its first two bytes (the bucket's low nibble and
+# the 35-character suffix) plus how often the password was seen
+_RECORD = struct.Struct(">18sI")
+_MAX_COUNT = 2 ** 32 - 1
+
+# Input line with hashes=True: a SHA-1 hex digest and an optional ":count"
+_HASH_LINE = re.compile(r"([0-9A-Fa-f]{40})(?::(\d+))?")
+
+
+def sha1_hex(password: str) -> str:
+    """Upper-case SHA-1 of a password, as used by Pwned Passwords range queries"""
+    return hashlib.sha1(password.encode("utf-8")).hexdigest().upper()
+
+
+class RangeStore:
+    """k-anonymity breach lookups: every suffix sharing a 5-hex SHA-1 prefix
+
+    Records are grouped into 16^5 buckets by hash prefix, and the bucket
+    offsets are read into memory when the store is opened (8 MiB), so a
+    range query is a single positioned read of one bucket. Callers only
+    need to reveal a hash prefix, which matches hundreds of breached
+    passwords in a large corpus, never the password or its full hash.
+    Hashes are taken of the exact password, like Pwned Passwords.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._fd = os.open(self.path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+        try:
+            header = os.pread(self._fd, _HEADER.size, 0)
+            if len(header) != _HEADER.size:
+                raise ValueError(f"{self.path} is not a range store")
+            magic, self.count = _HEADER.unpack(header)
+            if magic != _MAGIC:
+                raise ValueError(f"{self.path} is not a range store")
+
+            self._offsets = array("Q")
+            table_size = (_BUCKETS + 1) * _OFFSET.size
+            self._offsets.frombytes(os.pread(self._fd, table_size, _HEADER.size))
+            if len(self._offsets) != _BUCKETS + 1 or self._offsets[-1] != self.count:
+                raise ValueError(f"{self.path} is truncated or corrupt")
+            if sys.byteorder != "little":
+                self._offsets.byteswap()
+            self._records_start = _HEADER.size + table_size
+            if os.fstat(self._fd).st_size != self._records_start + self.count * _RECORD.size:
+                raise ValueError(f"{self.path} is truncated or corrupt")
+        except Exception:
+            os.close(self._fd)
+            raise
+
+    def __len__(self) -> int:
+        return self.count
+
+    def range(self, prefix: str) -> List[Tuple[str, int]]:
+        """(suffix, count) pairs for every stored hash starting with prefix"""
+        if len(prefix) != PREFIX_LENGTH:
+            raise ValueError(f"Prefix must be {PREFIX_LENGTH} hex characters")
+        bucket = int(prefix, 16)
+        start, end = self._offsets[bucket], self._offsets[bucket + 1]
+        data = os.pread(self._fd, (end - start) * _RECORD.size, self._records_start + start * _RECORD.size)
+        return [(suffix.hex().upper()[1:], count) for suffix, count in _RECORD.iter_unpack(data)]
+
+    def count_of(self, password: str) -> int:
+        """How often a password appears in the corpus, 0 if never"""
+        digest = sha1_hex(password)
+        suffix = digest[PREFIX_LENGTH:]
+        for candidate, count in self.range(digest[:PREFIX_LENGTH]):
+            if candidate == suffix:
+                return count
+        return 0
+
+    def __contains__(self, password: str) -> bool:
+        return self.count_of(password) > 0
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+    def __enter__(self) -> "RangeStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @classmethod
+    def build(cls, lines: Iterable[str], output: Union[str, Path], hashes: bool = False,
+              chunk_size: int = 5_000_000) -> int:
+        """Build a range store and return its number of distinct hashes
+
+        lines are plaintext passwords, one per line, or with hashes=True
+        upper- or lower-case SHA-1 hex digests with an optional ":count"
+        as in the Pwned Passwords downloads; any other line (an MD5 or NTLM
+        hash, a bad count) raises ValueError with its line number, since a
+        record of the wrong size would corrupt the rest of the store.
+        Duplicates are merged and their counts added. Like BreachIndex.build, sorting happens in
+        spilled chunks so memory stays bounded.
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            runs: List[Path] = []
+            chunk: List[bytes] = []
+            for line_number, line in enumerate(lines, 1):
+                line = line.rstrip("\r\n")
+                if not line:
+                    continue
+                if hashes:
+                    match = _HASH_LINE.fullmatch(line.strip())
+                    if match is None:
+                        raise ValueError(f"Line {line_number}: expected a SHA-1 hex digest with an optional "
+                                         f":count, got {line[:60]!r}")
+                    digest, count = match.groups()
+                    chunk.append(bytes.fromhex(digest) + struct.pack(">I", min(int(count or 1), _MAX_COUNT)))
+                else:
+                    chunk.append(hashlib.sha1(line.encode("utf-8")).digest() + b"\x00\x00\x00\x01")
+                if len(chunk) >= chunk_size:
+                    runs.append(_write_run(chunk, tmp_dir, len(runs)))
+                    chunk = []
+            if chunk or not runs:
+                runs.append(_write_run(chunk, tmp_dir, len(runs)))
+
+            offsets = array("Q", bytes((_BUCKETS + 1) * _OFFSET.size))
+            run_files = [open(run, "rb") for run in runs]
+            tmp_output = Path(str(output) + ".tmp")
+            try:
+                with open(tmp_output, "wb") as out:
+                    out.write(_HEADER.pack(_MAGIC, 0))
+                    out.write(bytes((_BUCKETS + 1) * _OFFSET.size))
+
+                    count = 0
+                    previous, total = None, 0
+
+                    def flush() -> None:
+                        nonlocal count
+                        out.write(_RECORD.pack(previous[2:], min(total, _MAX_COUNT)))
+                        offsets[(previous[0] << 12 | previous[1] << 4 | previous[2] >> 4) + 1] += 1
+                        count += 1
+
+                    for record in heapq.merge(*(_read_records(f, 24) for f in run_files)):
+                        digest = record[:20]
+                        if digest != previous:
+                            if previous is not None:
+                                flush()
+                            previous, total = digest, 0
+                        total += int.from_bytes(record[20:], "big")
+                    if previous is not None:
+                        flush()
+
+                    # Bucket sizes -> running offsets
+                    for bucket in range(1, _BUCKETS + 1):
+                        offsets[bucket] += offsets[bucket - 1]
+                    if sys.byteorder != "little":
+                        offsets.byteswap()
+                    out.seek(0)
+                    out.write(_HEADER.pack(_MAGIC, count))
+                    out.write(offsets.tobytes())
+                os.replace(tmp_output, output)
+            finally:
+                for f in run_files:
+                    f.close()
+                if tmp_output.exists():
+                    tmp_output.unlink()
+
+        return count
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Build or query a k-anonymity breach range store")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="Build a store from passwords or SHA-1 hashes, one per line")
+    build.add_argument("source", help="Input file, or - for stdin")
+    build.add_argument("output", help="Store to write, e.g. common_passwords.range")
+    build.add_argument("--hashes", action="store_true",
+                       help="Input lines are SHA-1 hex digests, optionally HASH:COUNT")
+    build.add_argument("--chunk-size", type=int, default=5_000_000,
+                       help="Entries sorted in memory at a time (default: 5000000)")
+
+    query = commands.add_parser("range", help="Print every SUFFIX:COUNT for a 5-character hash prefix")
+    query.add_argument("store", help="Range store file")
+    query.add_argument("prefix")
+
+    check = commands.add_parser("check", help="Check passwords, revealing only their hash prefix to the store")
+    check.add_argument("store", help="Range store file")
+    check.add_argument("passwords", nargs="+")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        source = sys.stdin if args.source == "-" else open(args.source, "r", encoding="utf-8", errors="replace")
+        try:
+            count = RangeStore.build(source, args.output, args.hashes, args.chunk_size)
+        finally:
+            if source is not sys.stdin:
+                source.close()
+        size = os.path.getsize(args.output)
+        print(f"Wrote {count:,} hashes to {args.output} ({size / 1024 / 1024:.1f} MiB)")
+        return 0
+
+    with RangeStore(args.store) as store:
+        if args.command == "range":
+            for suffix, count in store.range(args.prefix):
+                print(f"{suffix}:{count}")
+        else:
+            for password in args.passwords:
+                count = store.count_of(password)
+                print(f"{password}\t{f'found ({count:,} times)' if count else 'not found'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict
+
+
+class ScoreCache:
+    """Bounded LRU cache of scoring results, safe to share between threads
+
+    Entries are keyed by a keyed BLAKE2 hash of the password using a random
+    salt that only lives in this process, so the cache never holds the
+    plaintext and the keys are useless outside it. Nothing is persisted.
+    """
+
+    def __init__(self, max_size: int = 1024):
+        if max_size < 1:
+            raise ValueError("Cache size must be at least 1")
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._salt = os.urandom(16)
+        self._entries: "OrderedDict[bytes, dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _key(self, password: str) -> bytes:
+        return hashlib.blake2b(password.encode("utf-8"), key=self._salt, digest_size=16).digest()
+
+    def get_or_compute(self, password: str, compute: Callable[[str], dict]) -> dict:
+        """Return the cached result for password, computing and storing it on a miss"""
+        key = self._key(password)
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return _copy_result(result)
+            self.misses += 1
+
+        # Score outside the lock so other sessions are not held up
+        result = compute(password)
+
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return _copy_result(result)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
+
+
+def _copy_result(result: dict) -> dict:
+    """Copy the mutable parts of a result so callers cannot alter cached entries"""
+    return {**result, "feedback": list(result["feedback"]), "details": dict(result["details"])}
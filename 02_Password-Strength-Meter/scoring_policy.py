@@ -0,0 +1,182 @@
+import copy
+import json
+import math
+import string
+import tomllib
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, List, Union
+
+from pattern_matcher import PatternMatcher
+
+# Character classes in the order the "character_mix" bonus expects them,
+# and their indices in ScoringPolicy.char_classes
+CHARACTER_CLASSES = ("lowercase", "uppercase", "digits", "special")
+LOWERCASE, UPPERCASE, DIGITS, SPECIAL = range(len(CHARACTER_CLASSES))
+
+DEFAULT_POLICY = {
+    # Enhanced scoring weights with more granular controls
+    "weights": {
+        "length": 1.5,      # Increased weight for length
+        "uppercase": 1.0,   # Basic requirement
+        "lowercase": 1.0,   # Basic requirement
+        "digits": 1.0,      # Basic requirement
+        "special": 1.2,     # Bonus for special characters
+        "complexity": 1.3,  # Bonus for complexity
+        "entropy": 1.2      # Bonus for randomness
+    },
+
+    # Complexity penalties, applied at most once each
+    "penalties": {
+        "repeated": -0.5,            # Three or more repeated characters
+        "sequential_letters": -0.3,  # abc, bcd, ..., xyz
+        "sequential_numbers": -0.3,  # 123, 234, ..., 890
+        "keyboard": -0.4             # Keyboard patterns
+    },
+
+    # Literal patterns behind the penalties, compiled into one automaton
+    "patterns": {
+        "sequential_letters": [string.ascii_lowercase[i:i + 3] for i in range(24)],
+        "sequential_numbers": ["123", "234", "345", "456", "567", "678", "789", "890"],
+        "keyboard": ["qwerty", "asdfgh", "zxcvbn"]
+    },
+
+    # Complexity bonuses read from the character profile
+    "complexity_bonuses": {
+        "multiple_uppercase": 0.2,  # At least 2 uppercase letters
+        "multiple_special": 0.2,    # At least 2 special characters
+        "multiple_digits": 0.2,     # At least 3 numbers
+        "character_mix": 0.3        # Lowercase, uppercase, number, special in that order
+    },
+
+    # Special character set
+    "special_chars": "!@#$%^&*",
+
+    # Minimum requirements
+    "min_length": 8,
+    "recommended_length": 12,
+    "long_length": 16,
+
+    # Highest score for each strength level; anything above is top_strength
+    "strength_levels": {
+        "Very Weak": 2,
+        "Weak": 3,
+        "Moderate": 4,
+        "Strong": 5
+    },
+    "top_strength": "Very Strong",
+    "max_score": 6
+}
+
+# Sections a policy file replaces as a whole instead of merging into the
+# defaults: a tenant's own strength levels must not interleave with ours
+_REPLACED_SECTIONS = ("strength_levels",)
+
+
+class ScoringPolicy:
+    """Scoring rules for PasswordStrengthMeter, compiled once when loaded
+
+    A policy starts from DEFAULT_POLICY and overrides whichever sections a
+    JSON or TOML file provides, so tenants only spell out what differs;
+    tables are merged key by key, except strength_levels, which replaces
+    the default levels outright. Every value is type-checked here, and a
+    pattern group without a penalty weight is rejected, so a bad policy
+    fails when it is loaded rather than in the middle of scoring.
+    Loading builds everything the scorer needs per character or per call:
+    a character-to-class lookup table, the pattern lists for the automaton
+    and sorted strength thresholds for a binary search.
+    """
+
+    def __init__(self, config: Dict = None):
+        merged = copy.deepcopy(DEFAULT_POLICY)
+        for key, value in (config or {}).items():
+            if key not in merged:
+                raise ValueError(f"Unknown policy setting: {key}")
+            if isinstance(merged[key], dict):
+                if not isinstance(value, dict):
+                    raise ValueError(f"Policy setting {key} must be a table")
+                if key in _REPLACED_SECTIONS:
+                    merged[key] = dict(value)
+                else:
+                    merged[key].update(value)
+            else:
+                merged[key] = value
+
+        self.weights: Dict[str, float] = merged["weights"]
+        self.penalties: Dict[str, float] = merged["penalties"]
+        self.patterns: Dict[str, List[str]] = merged["patterns"]
+        self.complexity_bonuses: Dict[str, float] = merged["complexity_bonuses"]
+        self.special_chars: str = merged["special_chars"]
+        self.min_length: int = merged["min_length"]
+        self.recommended_length: int = merged["recommended_length"]
+        self.long_length: int = merged["long_length"]
+        self.max_score: float = merged["max_score"]
+
+        _validate(merged)
+        if self.min_length < 1:
+            raise ValueError("min_length must be at least 1")
+        missing = [key for key in ("length", "complexity", "entropy") + CHARACTER_CLASSES if key not in self.weights]
+        if missing:
+            raise ValueError(f"Policy is missing weights for: {', '.join(missing)}")
+        unweighted = [group for group in self.patterns if group not in self.penalties]
+        if unweighted:
+            raise ValueError(f"Pattern groups have no penalty weight: {', '.join(unweighted)}")
+
+        # Fixed threshold arrays: strength = labels[bisect_left(bounds, score)]
+        levels = sorted(merged["strength_levels"].items(), key=lambda item: item[1])
+        self.strength_bounds = tuple(bound for _, bound in levels)
+        self.strength_labels = tuple(label for label, _ in levels) + (merged["top_strength"],)
+
+        # Character -> index into CHARACTER_CLASSES. Letters and digits win
+        # over special_chars; characters missing from the table (non-ASCII
+        # digits included) are left to the scorer's str.isdecimal fallback.
+        self.char_classes: Dict[str, int] = {}
+        for index, chars in ((LOWERCASE, string.ascii_lowercase), (UPPERCASE, string.ascii_uppercase),
+                             (DIGITS, string.digits)):
+            for char in chars:
+                self.char_classes[char] = index
+        for char in self.special_chars:
+            self.char_classes.setdefault(char, DIGITS if char.isdecimal() else SPECIAL)
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path]) -> "ScoringPolicy":
+        """Load a policy from a .json or .toml file"""
+        path = Path(path)
+        if path.suffix.lower() == ".toml":
+            with open(path, "rb") as f:
+                return cls(tomllib.load(f))
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def strength(self, score: float) -> str:
+        """Strength label for a score"""
+        return self.strength_labels[bisect_left(self.strength_bounds, score)]
+
+    def build_matcher(self) -> PatternMatcher:
+        """A compiled pattern automaton for this policy's pattern groups"""
+        matcher = PatternMatcher(self.patterns)
+        matcher.compile()
+        return matcher
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+
+def _validate(policy: Dict) -> None:
+    """Raise ValueError for any setting of the wrong type"""
+    for section in ("weights", "penalties", "complexity_bonuses", "strength_levels"):
+        for name, value in policy[section].items():
+            if not _is_number(value):
+                raise ValueError(f"Policy setting {section}.{name} must be a number, got {value!r}")
+    for name, patterns in policy["patterns"].items():
+        if not isinstance(patterns, list) or not all(isinstance(pattern, str) for pattern in patterns):
+            raise ValueError(f"Policy setting patterns.{name} must be a list of strings")
+    for key in ("min_length", "recommended_length", "long_length"):
+        if not isinstance(policy[key], int) or isinstance(policy[key], bool):
+            raise ValueError(f"Policy setting {key} must be an integer, got {policy[key]!r}")
+    if not _is_number(policy["max_score"]):
+        raise ValueError(f"Policy setting max_score must be a number, got {policy['max_score']!r}")
+    for key in ("special_chars", "top_strength"):
+        if not isinstance(policy[key], str):
+            raise ValueError(f"Policy setting {key} must be a string, got {policy[key]!r}")
@@ -0,0 +1,331 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from parallel_scoring import _init_worker, _score_chunk, _shared_breach_index
+from range_store import PREFIX_LENGTH, RangeStore
+from scoring_policy import ScoringPolicy
+
+# Largest request body accepted, in bytes
+MAX_BODY_SIZE = 1 << 20
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class ServiceOverloaded(Exception):
+    """Raised when the scoring queue has no room for a request"""
+
+
+class BatchScorer:
+    """Coalesces concurrent scoring requests into micro-batches on a process pool
+
+    Each request puts its password on a bounded queue and waits on a
+    future. One collector task takes the first waiting password, keeps
+    gathering until max_batch_size passwords are queued or max_wait seconds
+    have passed, and sends the batch to a worker process in one round trip.
+    Up to one batch per worker is in flight at a time. When the queue is
+    full, score_many raises ServiceOverloaded instead of queueing more work;
+    a request that could never fit (more than max_queue passwords) raises
+    ValueError, since retrying it would not help. Workers map one shared
+    breach index, built up front like ParallelScorer's. If a worker dies,
+    the requests in that batch fail and a fresh pool takes the next one.
+    """
+
+    def __init__(self, workers: int = None, max_batch_size: int = 64, max_wait: float = 0.005,
+                 max_queue: int = 1024, breach_index: Union[str, Path, None] = None,
+                 bloom_filter: Union[str, Path, None] = None,
+                 policy: Union[str, Path, ScoringPolicy, None] = None):
+        if max_batch_size < 1 or max_queue < 1:
+            raise ValueError("max_batch_size and max_queue must be at least 1")
+        self.workers = workers or os.cpu_count() or 1
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.max_queue = max_queue
+        if policy is not None and not isinstance(policy, ScoringPolicy):
+            policy = ScoringPolicy.from_file(policy)
+        self.breach_index, self._tmp_dir = _shared_breach_index(breach_index)
+        self._initargs = (self.breach_index, str(bloom_filter) if bloom_filter else None, policy)
+        self._executor = self._new_executor()
+        self._queue: Optional[asyncio.Queue] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._collector: Optional[asyncio.Task] = None
+        self._batches = set()
+        self.batches = 0
+        self.scored = 0
+        self.rejected = 0
+
+    async def start(self) -> None:
+        self._queue = asyncio.Queue(self.max_queue)
+        self._slots = asyncio.Semaphore(self.workers)
+        self._collector = asyncio.create_task(self._collect())
+
+    async def close(self) -> None:
+        if self._collector is not None:
+            self._collector.cancel()
+            try:
+                await self._collector
+            except asyncio.CancelledError:
+                pass
+            self._collector = None
+        for task in list(self._batches):
+            task.cancel()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        if self._tmp_dir is not None:
+            self._tmp_dir.cleanup()
+            self._tmp_dir = None
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        # Workers start on demand, while clients are connected; forked ones would
+        # inherit the open sockets and keep them alive after the server closes them
+        return ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("forkserver"),
+                                   initializer=_init_worker, initargs=self._initargs)
+
+    async def score(self, password: str) -> Dict:
+        """Score one password as part of the next batch"""
+        return (await self.score_many([password]))[0]
+
+    async def score_many(self, passwords: List[str]) -> List[Dict]:
+        """Queue several passwords at once; all or none are accepted"""
+        if len(passwords) > self.max_queue:
+            raise ValueError(f"At most {self.max_queue} passwords per request")
+        if self._queue.qsize() + len(passwords) > self.max_queue:
+            self.rejected += len(passwords)
+            raise ServiceOverloaded(f"Scoring queue is full ({self.max_queue} passwords)")
+        loop = asyncio.get_running_loop()
+        futures = []
+        for password in passwords:
+            future = loop.create_future()
+            self._queue.put_nowait((password, future))
+            futures.append(future)
+        return await asyncio.gather(*futures)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "max_queue": self.max_queue,
+            "batches": self.batches,
+            "scored": self.scored,
+            "rejected": self.rejected,
+            "avg_batch_size": round(self.scored / self.batches, 2) if self.batches else 0
+        }
+
+    async def _collect(self) -> None:
+        loop = asyncio.get_running_loop()
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                if queue.empty():
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    batch.append(queue.get_nowait())
+
+            # Waiting for a free worker here leaves new requests on the queue,
+            # where they join the next batch or hit the queue limit
+            await self._slots.acquire()
+            task = asyncio.create_task(self._run_batch(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _run_batch(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        try:
+            passwords = [password for password, _ in batch]
+            executor = self._executor
+            try:
+                results = await asyncio.get_running_loop().run_in_executor(executor, _score_chunk, passwords)
+            except Exception as exc:
+                if isinstance(exc, BrokenProcessPool) and executor is self._executor:
+                    # A worker died and took the pool with it; later batches get a new one
+                    self._executor = self._new_executor()
+                    executor.shutdown(wait=False, cancel_futures=True)
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+                return
+            self.batches += 1
+            self.scored += len(batch)
+            for (_, future), result in zip(batch, results):
+                if not future.done():  # The client may have gone away
+                    future.set_result(result)
+        finally:
+            self._slots.release()
+
+
+class ScoringServer:
+    """Minimal HTTP/1.1 JSON front end for BatchScorer, with keep-alive
+
+    POST /score takes {"password": "..."} or {"passwords": [...]} and
+    returns the check_password_strength result (or a list of them).
+    GET /health returns queue and batching counters. A full queue answers
+    503 with Retry-After so callers back off instead of piling up; a batch
+    larger than the whole queue gets 413, as it can never be accepted, and a
+    batch the workers fail to score gets 500. With a
+    range store, GET /range/<5 hex chars> returns every matching hash
+    suffix and count, so clients can check a password without sending it.
+    """
+
+    def __init__(self, scorer: BatchScorer, host: str = "127.0.0.1", port: int = 8080,
+                 range_store: Union[str, Path, RangeStore, None] = None):
+        self.scorer = scorer
+        self.host = host
+        self.port = port
+        if range_store is not None and not isinstance(range_store, RangeStore):
+            range_store = RangeStore(range_store)
+        self.range_store = range_store
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        await self.scorer.start()
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        try:
+            async with self._server:
+                await self._server.serve_forever()
+        finally:
+            await self.scorer.close()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        await self.scorer.close()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                parts = request_line.decode("latin-1").split()
+                if len(parts) != 3:
+                    await self._respond(writer, 400, {"error": "Malformed request line"}, keep_alive=False)
+                    break
+                method, path, version = parts
+                keep_alive = headers.get("connection", "").lower() != "close" and version != "HTTP/1.0"
+
+                length = int(headers.get("content-length", "0") or 0)
+                if length > MAX_BODY_SIZE:
+                    await self._respond(writer, 413, {"error": "Request body too large"}, keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                status, payload, extra = await self._dispatch(method, path, body)
+                await self._respond(writer, status, payload, keep_alive, extra)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method: str, path: str, body: bytes) -> Tuple[int, object, Dict[str, str]]:
+        if path == "/health":
+            if method != "GET":
+                return 405, {"error": "Use GET"}, {}
+            return 200, {"status": "ok", **self.scorer.stats()}, {}
+        if path.startswith("/range/") and self.range_store is not None:
+            if method != "GET":
+                return 405, {"error": "Use GET"}, {}
+            prefix = path[len("/range/"):].upper()
+            if len(prefix) != PREFIX_LENGTH or any(char not in "0123456789ABCDEF" for char in prefix):
+                return 400, {"error": f"Prefix must be {PREFIX_LENGTH} hex characters"}, {}
+            return 200, {"prefix": prefix, "suffixes": dict(self.range_store.range(prefix))}, {}
+        if path != "/score":
+            return 404, {"error": "Not found"}, {}
+        if method != "POST":
+            return 405, {"error": "Use POST"}, {}
+
+        try:
+            request = json.loads(body)
+        except ValueError:
+            return 400, {"error": "Body must be JSON"}, {}
+        if isinstance(request, dict) and isinstance(request.get("password"), str):
+            passwords, single = [request["password"]], True
+        elif (isinstance(request, dict) and isinstance(request.get("passwords"), list)
+              and all(isinstance(password, str) for password in request["passwords"])):
+            passwords, single = request["passwords"], False
+        else:
+            return 400, {"error": 'Expected {"password": "..."} or {"passwords": [...]}'}, {}
+        if len(passwords) > self.scorer.max_queue:
+            return 413, {"error": f"At most {self.scorer.max_queue} passwords per request"}, {}
+
+        try:
+            results = await self.scorer.score_many(passwords)
+        except ServiceOverloaded as exc:
+            return 503, {"error": str(exc)}, {"Retry-After": "1"}
+        except Exception as exc:
+            print(f"Scoring failed: {exc!r}", file=sys.stderr)
+            return 500, {"error": "Scoring failed"}, {}
+        return 200, results[0] if single else results, {}
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: int, payload: object,
+                       keep_alive: bool, extra_headers: Dict[str, str] = None) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        headers = [
+            f"HTTP/1.1 {status} {_REASONS.get(status, '')}",
+            "Content-Type: application/json",
+            f"Content-Length: {len(body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}"
+        ]
+        headers += [f"{name}: {value}" for name, value in (extra_headers or {}).items()]
+        writer.write(("\r\n".join(headers) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Serve password scoring over HTTP/JSON with request batching")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on (default: 8080)")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Scoring processes (default: CPU count)")
+    parser.add_argument("--max-batch-size", type=int, default=64, help="Passwords per batch (default: 64)")
+    parser.add_argument("--max-wait-ms", type=float, default=5.0,
+                        help="How long a batch waits to fill up, in milliseconds (default: 5)")
+    parser.add_argument("--max-queue", type=int, default=1024,
+                        help="Queued passwords before requests get 503 (default: 1024)")
+    parser.add_argument("--breach-index", help="Prebuilt breach index (default: common_passwords.idx or .txt)")
+    parser.add_argument("--bloom-filter", help="Bloom filter checked before the breach index (default: common_passwords.bloom)")
+    parser.add_argument("--policy", help="Scoring policy file (.json or .toml)")
+    parser.add_argument("--range-store", help="Range store to serve at GET /range/<prefix>")
+    args = parser.parse_args(argv)
+
+    scorer = BatchScorer(args.workers, args.max_batch_size, args.max_wait_ms / 1000, args.max_queue,
+                         args.breach_index, args.bloom_filter, args.policy)
+    server = ScoringServer(scorer, args.host, args.port, args.range_store)
+    print(f"Scoring on http://{args.host}:{args.port} with {scorer.workers} workers "
+          f"(batches of up to {args.max_batch_size}, {args.max_wait_ms:g} ms wait)", file=sys.stderr)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())